@@ -1,7 +1,92 @@
 import numpy as np
-import pandas as pd
-from scipy import stats
+from scipy import special
 import math
+from functools import lru_cache
+
+# Tabela de fatoriais para o cálculo direto da PMF de Poisson no caminho numba
+_FACT = np.array([math.factorial(i) for i in range(32)], dtype=np.float64)
+
+def _poisson_pmf_vec(lam, n):
+    """
+    Calcula a PMF de Poisson para 0..n gols sem passar pelo scipy.stats
+    
+    Args:
+        lam: Média de gols esperados
+        n: Número máximo de gols
+        
+    Returns:
+        Array numpy com as probabilidades de 0 a n gols
+    """
+    # Com média zero toda a massa fica em 0 gols (mesmo comportamento do scipy)
+    if lam == 0:
+        return np.eye(1, n+1)[0]
+    
+    # Cálculo em espaço logarítmico: evita lam**k e overflow do fatorial.
+    # Média negativa resulta em NaN (como no scipy) em vez de erro no log
+    k = np.arange(n+1)
+    with np.errstate(invalid='ignore'):
+        log_p = -lam + k * np.log(lam) - special.gammaln(k + 1)
+    return np.exp(log_p)
+
+def _dixon_coles_matrix_kernel(lambda_x, lambda_y, max_goals, rho):
+    """Monta a matriz Dixon-Coles normalizada em um único laço (compilado com numba)"""
+    out = np.empty((max_goals+1, max_goals+1))
+    exp_x = math.exp(-lambda_x)
+    exp_y = math.exp(-lambda_y)
+    for i in range(max_goals+1):
+        p_x = exp_x * lambda_x**i / _FACT[i]
+        for j in range(max_goals+1):
+            out[i, j] = p_x * exp_y * lambda_y**j / _FACT[j]
+    out[0, 0] *= 1 - lambda_x * lambda_y * rho
+    if max_goals >= 1:
+        out[0, 1] *= 1 + lambda_x * rho
+        out[1, 0] *= 1 + lambda_y * rho
+        out[1, 1] *= 1 - rho
+    return out / out.sum()
+
+# Versão compilada do kernel: None enquanto não foi pedida, False sem numba
+_dixon_coles_matrix_jit = None
+
+def _get_dixon_coles_jit():
+    """
+    Importa o numba e compila o kernel Dixon-Coles apenas na primeira chamada,
+    sem pesar na importação do módulo
+    
+    Returns:
+        Função compilada, ou None se o numba não estiver instalado
+    """
+    global _dixon_coles_matrix_jit
+    if _dixon_coles_matrix_jit is None:
+        try:
+            import numba as nb
+        except ImportError:  # numba é opcional; sem ele usamos a versão numpy
+            _dixon_coles_matrix_jit = False
+        else:
+            _dixon_coles_matrix_jit = nb.njit(cache=True)(_dixon_coles_matrix_kernel)
+    return _dixon_coles_matrix_jit or None
+
+@lru_cache(maxsize=32)
+def calculate_poisson_pmfs(home_expected_goals, away_expected_goals, max_goals=5):
+    """
+    Calcula as distribuições de Poisson de gols de cada time
+    
+    Args:
+        home_expected_goals: Média de gols esperados para o time da casa
+        away_expected_goals: Média de gols esperados para o time de fora
+        max_goals: Número máximo de gols a considerar (default: 5)
+        
+    Returns:
+        Tupla (home_probs, away_probs) de arrays numpy somente leitura com as
+        probabilidades de 0 a max_goals gols de cada time
+    """
+    home_probs = _poisson_pmf_vec(home_expected_goals, max_goals)
+    away_probs = _poisson_pmf_vec(away_expected_goals, max_goals)
+    
+    # Os arrays ficam no cache e são compartilhados entre chamadas
+    home_probs.flags.writeable = False
+    away_probs.flags.writeable = False
+    
+    return home_probs, away_probs
 
 def calculate_poisson_probabilities(home_expected_goals, away_expected_goals, max_goals=5):
     """
@@ -13,120 +98,116 @@ def calculate_poisson_probabilities(home_expected_goals, away_expected_goals, ma
         max_goals: Número máximo de gols a considerar (default: 5)
         
     Returns:
-        DataFrame com as probabilidades de cada placar
+        Array numpy (linhas: gols da casa, colunas: gols de fora) com as probabilidades de cada placar
     """
-    # Criando matriz de probabilidades
-    probabilidades = np.zeros((max_goals+1, max_goals+1))
-    
-    # Calculando probabilidades para cada combinação de gols
-    for i in range(max_goals+1):
-        for j in range(max_goals+1):
-            # Probabilidade de Poisson
-            home_prob = stats.poisson.pmf(i, home_expected_goals)
-            away_prob = stats.poisson.pmf(j, away_expected_goals)
-            
-            # Probabilidade conjunta
-            probabilidades[i, j] = home_prob * away_prob
-    
-    # Convertendo para DataFrame para melhor visualização
-    df_prob = pd.DataFrame(probabilidades)
-    df_prob.columns = [f'Fora {i}' for i in range(max_goals+1)]
-    df_prob.index = [f'Casa {i}' for i in range(max_goals+1)]
-    
-    return df_prob
+    # Probabilidades de Poisson para cada número de gols (uma vez por time)
+    home_probs, away_probs = calculate_poisson_pmfs(home_expected_goals, away_expected_goals, max_goals)
+
+    # Probabilidade conjunta (produto externo via broadcasting)
+    return home_probs[:, None] * away_probs[None, :]
 
 def adjust_probabilities_with_history(prob_base, historical_results, weight=0.3, max_goals=5):
     """
     Ajusta as probabilidades base considerando o histórico de confrontos diretos
     
     Args:
-        prob_base: DataFrame com probabilidades base (Poisson)
-        historical_results: Lista de tuplas (gols_casa, gols_fora) dos confrontos históricos
+        prob_base: Array numpy com probabilidades base (Poisson)
+        historical_results: Array Nx2 (ou lista de tuplas) com (gols_casa, gols_fora) dos confrontos históricos
         weight: Peso a ser dado ao histórico (entre 0 e 1)
         max_goals: Número máximo de gols a considerar
         
     Returns:
-        DataFrame com probabilidades ajustadas
+        Array numpy com probabilidades ajustadas
     """
+    base = np.asarray(prob_base)
+    
     # Criando matriz de frequências históricas
-    freq_historica = np.zeros((max_goals+1, max_goals+1))
-    
-    # Contando ocorrências de cada placar no histórico
-    for gols_casa, gols_fora in historical_results:
-        if gols_casa <= max_goals and gols_fora <= max_goals:
-            freq_historica[gols_casa, gols_fora] += 1
-        elif gols_casa > max_goals and gols_fora <= max_goals:
-            freq_historica[max_goals, gols_fora] += 1
-        elif gols_casa <= max_goals and gols_fora > max_goals:
-            freq_historica[gols_casa, max_goals] += 1
-        else:
-            freq_historica[max_goals, max_goals] += 1
+    freq_historica = np.zeros_like(base, dtype=np.float64)
+    
+    # Contando ocorrências de cada placar no histórico (placares acima do máximo
+    # são agrupados na última linha/coluna)
+    resultados = np.asarray(historical_results, dtype=np.intp).reshape(-1, 2)
+    resultados = np.minimum(resultados, max_goals)
+    np.add.at(freq_historica, (resultados[:, 0], resultados[:, 1]), 1)
     
     # Normalizando para obter probabilidades
-    if np.sum(freq_historica) > 0:
-        prob_historica = freq_historica / np.sum(freq_historica)
-    else:
-        prob_historica = np.zeros_like(freq_historica)
+    prob_historica = freq_historica
+    total = prob_historica.sum()
+    if total > 0:
+        prob_historica /= total
     
-    # Combinando probabilidades base com históricas
-    prob_ajustada = (1 - weight) * prob_base.values + weight * prob_historica
+    # Combinando probabilidades base com históricas (operações in-place para
+    # evitar temporários intermediários)
+    prob_ajustada = np.multiply(base, 1 - weight)
+    prob_historica *= weight
+    prob_ajustada += prob_historica
     
     # Normalizando para garantir que a soma seja 1
-    prob_ajustada = prob_ajustada / np.sum(prob_ajustada)
+    prob_ajustada *= 1.0 / prob_ajustada.sum()
+    
+    return prob_ajustada
+
+# Limites de gols dos mercados Over/Under
+_LIMITES_OVER = (0.5, 1.5, 2.5, 3.5, 4.5)
+
+@lru_cache(maxsize=8)
+def _make_market_fn(n_linhas, n_colunas):
+    """
+    Gera uma função especializada para matrizes de um tamanho fixo, com os
+    índices do 1X2 e do total de gols pré-calculados
     
-    # Convertendo para DataFrame
-    df_prob_ajustada = pd.DataFrame(prob_ajustada)
-    df_prob_ajustada.columns = prob_base.columns
-    df_prob_ajustada.index = prob_base.index
+    Args:
+        n_linhas: Número de linhas da matriz (gols da casa)
+        n_colunas: Número de colunas da matriz (gols de fora)
+        
+    Returns:
+        Função que recebe a matriz e retorna (casa, empate, fora, over, ambas marcam)
+    """
+    i, j = np.indices((n_linhas, n_colunas))
+    total_gols = (i + j).ravel()
+    idx_casa = np.flatnonzero(i > j)
+    idx_empate = np.flatnonzero(i == j)
+    idx_fora = np.flatnonzero(i < j)
+    n_totais = n_linhas + n_colunas - 1
+    inicio_over = [(limite, int(limite) + 1) for limite in _LIMITES_OVER]
+    
+    def fn(M, dist_total_gols=None):
+        flat = M.ravel()
+        
+        # Resultado (1X2): abaixo, sobre e acima da diagonal principal
+        prob_vitoria_casa = flat[idx_casa].sum()
+        prob_empate = flat[idx_empate].sum()
+        prob_vitoria_fora = flat[idx_fora].sum()
+        
+        # Distribuição do total de gols, calculada em uma única passada pela matriz
+        if dist_total_gols is None:
+            dist_total_gols = np.bincount(total_gols, weights=flat, minlength=n_totais)
+        prob_over = {limite: dist_total_gols[inicio:].sum() for limite, inicio in inicio_over}
+        
+        # Ambas marcam
+        prob_ambas_marcam = M[1:, 1:].sum()
+        
+        return prob_vitoria_casa, prob_empate, prob_vitoria_fora, prob_over, prob_ambas_marcam
     
-    return df_prob_ajustada
+    return fn
 
-def calculate_market_probabilities(matriz_prob):
+def calculate_market_probabilities(matriz_prob, totals_dist=None):
     """
     Calcula probabilidades para diferentes mercados de apostas
     
     Args:
-        matriz_prob: DataFrame com probabilidades de placares
+        matriz_prob: Array numpy com probabilidades de placares
+        totals_dist: Distribuição do total de gols já calculada (opcional), por
+            exemplo np.convolve(home_probs, away_probs) no modelo Poisson puro
         
     Returns:
         Dicionário com probabilidades para diferentes mercados
     """
-    max_gols = matriz_prob.shape[0] - 1
+    M = np.asarray(matriz_prob)
     probabilidades = {}
     
-    # Resultado (1X2)
-    prob_vitoria_casa = 0
-    prob_empate = 0
-    prob_vitoria_fora = 0
-    
-    # Over/Under
-    prob_over = {i: 0 for i in [0.5, 1.5, 2.5, 3.5, 4.5]}
-    
-    # Ambas marcam
-    prob_ambas_marcam = 0
-    
-    # Calculando probabilidades para cada mercado
-    for i in range(max_gols+1):
-        for j in range(max_gols+1):
-            prob = matriz_prob.iloc[i, j]
-            
-            # Resultado
-            if i > j:
-                prob_vitoria_casa += prob
-            elif i == j:
-                prob_empate += prob
-            else:
-                prob_vitoria_fora += prob
-            
-            # Over/Under
-            total_gols = i + j
-            for limite in prob_over.keys():
-                if total_gols > limite:
-                    prob_over[limite] += prob
-            
-            # Ambas marcam
-            if i > 0 and j > 0:
-                prob_ambas_marcam += prob
+    prob_vitoria_casa, prob_empate, prob_vitoria_fora, prob_over, prob_ambas_marcam = \
+        _make_market_fn(*M.shape)(M, totals_dist)
     
     # Organizando resultados
     probabilidades['1'] = prob_vitoria_casa
@@ -142,29 +223,39 @@ def calculate_market_probabilities(matriz_prob):
     
     return probabilidades
 
-def find_most_probable_scores(matriz_prob, n=5):
+def find_most_probable_scores(matriz_prob, n=10):
     """
     Encontra os n placares mais prováveis
     
     Args:
-        matriz_prob: DataFrame com probabilidades de placares
-        n: Número de placares a retornar
+        matriz_prob: Array numpy com probabilidades de placares
+        n: Número de placares a retornar (default: 10, o maior recorte usado no app)
         
     Returns:
         Lista de tuplas (placar, probabilidade)
     """
-    placares = []
-    
-    for i in range(matriz_prob.shape[0]):
-        for j in range(matriz_prob.shape[1]):
-            placar = f"{i}-{j}"
-            prob = matriz_prob.iloc[i, j]
-            placares.append((placar, prob))
+    if n <= 0:
+        return []
+    
+    M = np.asarray(matriz_prob)
+    flat = M.ravel()
+    n = min(n, flat.size)
+    
+    # Selecionando os n maiores sem ordenar a matriz inteira; empates no limite
+    # são resolvidos pela ordem dos placares na matriz
+    if n < flat.size:
+        limite = np.partition(flat, flat.size - n)[flat.size - n]
+        maiores = np.flatnonzero(flat > limite)
+        empates = np.flatnonzero(flat == limite)[:n - maiores.size]
+        idx = np.sort(np.concatenate((maiores, empates)))
+    else:
+        idx = np.arange(flat.size)
     
-    # Ordenando por probabilidade (decrescente)
-    placares_ordenados = sorted(placares, key=lambda x: x[1], reverse=True)
+    # Ordenando apenas os selecionados por probabilidade (decrescente, estável)
+    idx = idx[np.argsort(-flat[idx], kind='stable')]
+    rows, cols = np.divmod(idx, M.shape[1])
     
-    return placares_ordenados[:n]
+    return [(f"{r}-{c}", flat[k]) for r, c, k in zip(rows, cols, idx)]
 
 def calculate_expected_value(probabilidade, odd):
     """
@@ -192,32 +283,24 @@ def dixon_coles_adjustment(home_expected_goals, away_expected_goals, rho=-0.1):
     Returns:
         Função que calcula a probabilidade ajustada para um placar específico
     """
-    def tau(x, y, lambda_x, lambda_y, rho):
-        if x == 0 and y == 0:
-            return 1 - lambda_x * lambda_y * rho
-        elif x == 0 and y == 1:
-            return 1 + lambda_x * rho
-        elif x == 1 and y == 0:
-            return 1 + lambda_y * rho
-        elif x == 1 and y == 1:
-            return 1 - rho
-        else:
-            return 1.0
-    
+    lambda_x = home_expected_goals
+    lambda_y = away_expected_goals
+
+    # Fator tau: identidade fora dos placares 0-0, 0-1, 1-0 e 1-1
+    tau = {
+        (0, 0): 1 - lambda_x * lambda_y * rho,
+        (0, 1): 1 + lambda_x * rho,
+        (1, 0): 1 + lambda_y * rho,
+        (1, 1): 1 - rho
+    }
+
     def dc_prob(x, y):
         """Calcula a probabilidade Dixon-Coles para o placar x-y"""
-        lambda_x = home_expected_goals
-        lambda_y = away_expected_goals
-        
-        # Probabilidade de Poisson
-        p_x = stats.poisson.pmf(x, lambda_x)
-        p_y = stats.poisson.pmf(y, lambda_y)
-        
-        # Ajuste de Dixon-Coles
-        adjustment = tau(x, y, lambda_x, lambda_y, rho)
-        
-        return p_x * p_y * adjustment
-    
+        p_x = _poisson_pmf_vec(lambda_x, x)[x]
+        p_y = _poisson_pmf_vec(lambda_y, y)[y]
+
+        return p_x * p_y * tau.get((x, y), 1.0)
+
     return dc_prob
 
 def calculate_dixon_coles_matrix(home_expected_goals, away_expected_goals, max_goals=5, rho=-0.1):
@@ -231,28 +314,32 @@ def calculate_dixon_coles_matrix(home_expected_goals, away_expected_goals, max_g
         rho: Parâmetro de correlação
         
     Returns:
-        DataFrame com as probabilidades de cada placar
+        Array numpy com as probabilidades de cada placar
     """
-    # Obter função de probabilidade Dixon-Coles
-    dc_prob = dixon_coles_adjustment(home_expected_goals, away_expected_goals, rho)
-    
-    # Criar matriz de probabilidades
-    probabilidades = np.zeros((max_goals+1, max_goals+1))
-    
-    # Calcular probabilidades para cada combinação de gols
-    for i in range(max_goals+1):
-        for j in range(max_goals+1):
-            probabilidades[i, j] = dc_prob(i, j)
-    
-    # Normalizar para garantir que a soma seja 1
-    probabilidades = probabilidades / np.sum(probabilidades)
-    
-    # Converter para DataFrame
-    df_prob = pd.DataFrame(probabilidades)
-    df_prob.columns = [f'Fora {i}' for i in range(max_goals+1)]
-    df_prob.index = [f'Casa {i}' for i in range(max_goals+1)]
+    lambda_x = home_expected_goals
+    lambda_y = away_expected_goals
+
+    # Médias negativas ou NaN seguem pelo numpy, que devolve NaN como o scipy
+    jit = _get_dixon_coles_jit() if max_goals < len(_FACT) and lambda_x >= 0 and lambda_y >= 0 else None
+    if jit is not None:
+        # Caminho compilado com numba (útil para varreduras de rho)
+        probabilidades = jit(float(lambda_x), float(lambda_y), int(max_goals), float(rho))
+    else:
+        # Matriz de Poisson independente (produto externo)
+        home_probs, away_probs = calculate_poisson_pmfs(lambda_x, lambda_y, max_goals)
+        probabilidades = home_probs[:, None] * away_probs[None, :]
+
+        # Ajuste de Dixon-Coles: tau só difere de 1 nos placares 0-0, 0-1, 1-0 e 1-1
+        probabilidades[0, 0] *= 1 - lambda_x * lambda_y * rho
+        if max_goals >= 1:
+            probabilidades[0, 1] *= 1 + lambda_x * rho
+            probabilidades[1, 0] *= 1 + lambda_y * rho
+            probabilidades[1, 1] *= 1 - rho
+
+        # Normalizar para garantir que a soma seja 1
+        probabilidades = probabilidades / np.sum(probabilidades)
     
-    return df_prob
+    return probabilidades
 
 def calculate_kelly_criterion(probability, odd, fraction=1.0):
     """
@@ -1,15 +1,9 @@
 import os
 import sys
+from functools import partial
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
-import re
-from datetime import datetime
-import base64
-from io import BytesIO
 
 # Adicionar diretório atual ao path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -20,24 +14,8 @@ from data_processor import (
     process_historical_matches_text,
     process_statistics_text
 )
-from analyzer import (
-    calculate_poisson_probabilities,
-    adjust_probabilities_with_history,
-    calculate_market_probabilities,
-    find_most_probable_scores,
-    calculate_expected_value,
-    dixon_coles_adjustment,
-    calculate_dixon_coles_matrix,
-    calculate_kelly_criterion
-)
-from visualizer import (
-    create_probability_matrix_heatmap,
-    create_market_probabilities_chart,
-    create_most_probable_scores_chart,
-    create_historical_comparison_chart,
-    create_expected_value_chart,
-    create_team_comparison_chart
-)
+# analyzer (scipy) e visualizer (matplotlib) são importados sob demanda,
+# apenas depois que o usuário pede a análise, para acelerar o carregamento inicial
 from report_generator import (
     generate_technical_report,
     generate_humanized_interpretation
@@ -162,106 +140,137 @@ def main():
         "Os resultados são baseados em modelos estatísticos e não garantem sucesso em apostas."
     )
 
+@st.cache_data(show_spinner="Processando dados...", max_entries=32)
 def process_data(odds_text, historical_matches_text, statistics_text, 
                 use_dixon_coles=True, history_weight=0.3, max_goals=5, kelly_fraction=0.5):
     """
     Processa os dados de entrada e gera os resultados da análise
     """
-    with st.spinner("Processando dados..."):
-        # Processar textos de entrada
-        odds_data = process_odds_text(odds_text)
-        historical_data = process_historical_matches_text(historical_matches_text)
-        stats_data = process_statistics_text(statistics_text)
-        
-        # Extrair informações relevantes
-        home_team = stats_data.get('home_team', 'Time da Casa')
-        away_team = stats_data.get('away_team', 'Time Visitante')
-        
-        # Calcular gols esperados
-        home_expected_goals = stats_data.get('home_expected_goals', 1.5)
-        away_expected_goals = stats_data.get('away_expected_goals', 1.0)
-        
-        # Ajustar com base na força relativa
-        strength_adjustment = 0.15
-        if 'home_position' in stats_data and 'away_position' in stats_data:
-            position_diff = stats_data['away_position'] - stats_data['home_position']
-            strength_adjustment = min(0.3, max(0.0, 0.1 + position_diff * 0.02))
-        
-        adjusted_home_expected_goals = home_expected_goals * (1 + strength_adjustment)
-        adjusted_away_expected_goals = away_expected_goals * (1 - strength_adjustment)
-        
-        # Calcular probabilidades base usando Poisson ou Dixon-Coles
-        if use_dixon_coles:
-            # Usar modelo Dixon-Coles com correlação negativa entre gols
-            prob_matrix = calculate_dixon_coles_matrix(
-                adjusted_home_expected_goals, 
-                adjusted_away_expected_goals,
-                max_goals=max_goals,
-                rho=-0.1  # Correlação negativa padrão
-            )
-        else:
-            # Usar modelo Poisson padrão
-            prob_matrix = calculate_poisson_probabilities(
-                adjusted_home_expected_goals, 
+    from analyzer import (
+        calculate_poisson_pmfs,
+        calculate_poisson_probabilities,
+        adjust_probabilities_with_history,
+        calculate_market_probabilities,
+        find_most_probable_scores,
+        calculate_dixon_coles_matrix
+    )
+    
+    # Processar textos de entrada
+    odds_data = process_odds_text(odds_text)
+    historical_data = process_historical_matches_text(historical_matches_text, include_matches=False)
+    stats_data = process_statistics_text(statistics_text)
+    
+    # Extrair informações relevantes
+    home_team = stats_data.get('home_team', 'Time da Casa')
+    away_team = stats_data.get('away_team', 'Time Visitante')
+    
+    # Calcular gols esperados
+    home_expected_goals = stats_data.get('home_expected_goals', 1.5)
+    away_expected_goals = stats_data.get('away_expected_goals', 1.0)
+    
+    # Ajustar com base na força relativa
+    strength_adjustment = 0.15
+    if 'home_position' in stats_data and 'away_position' in stats_data:
+        position_diff = stats_data['away_position'] - stats_data['home_position']
+        strength_adjustment = min(0.3, max(0.0, 0.1 + position_diff * 0.02))
+    
+    adjusted_home_expected_goals = home_expected_goals * (1 + strength_adjustment)
+    adjusted_away_expected_goals = away_expected_goals * (1 - strength_adjustment)
+    
+    # Distribuição do total de gols, válida enquanto a matriz for o produto das
+    # distribuições de cada time (Poisson sem ajuste pelo histórico)
+    use_history = bool(historical_data) and 'match_results' in historical_data
+    totals_dist = None
+    
+    # Calcular probabilidades base usando Poisson ou Dixon-Coles
+    if use_dixon_coles:
+        # Usar modelo Dixon-Coles com correlação negativa entre gols
+        prob_matrix = calculate_dixon_coles_matrix(
+            adjusted_home_expected_goals, 
+            adjusted_away_expected_goals,
+            max_goals=max_goals,
+            rho=-0.1  # Correlação negativa padrão
+        )
+    else:
+        # Usar modelo Poisson padrão
+        prob_matrix = calculate_poisson_probabilities(
+            adjusted_home_expected_goals, 
+            adjusted_away_expected_goals,
+            max_goals=max_goals
+        )
+        if not use_history:
+            home_probs, away_probs = calculate_poisson_pmfs(
+                adjusted_home_expected_goals,
                 adjusted_away_expected_goals,
-                max_goals=max_goals
-            )
-        
-        # Ajustar com histórico
-        if historical_data and 'match_results' in historical_data:
-            prob_matrix = adjust_probabilities_with_history(
-                prob_matrix, 
-                historical_data['match_results'],
-                weight=history_weight,
-                max_goals=max_goals
+                max_goals
             )
-        
-        # Calcular probabilidades de mercados
-        market_probs = calculate_market_probabilities(prob_matrix)
-        
-        # Encontrar placares mais prováveis
-        top_scores = find_most_probable_scores(prob_matrix, n=10)
-        
-        # Calcular valor esperado e Kelly
-        market_ev = {}
-        kelly_stakes = {}
-        if 'market_odds' in odds_data:
-            for market, odd in odds_data['market_odds'].items():
-                if market in market_probs:
-                    prob = market_probs[market]
-                    market_ev[market] = calculate_expected_value(prob, odd)
-                    kelly_stakes[market] = calculate_kelly_criterion(prob, odd, kelly_fraction)
-        
-        # Gerar relatórios
-        technical_report = generate_technical_report(
-            home_team, away_team,
-            adjusted_home_expected_goals, adjusted_away_expected_goals,
-            prob_matrix, market_probs, top_scores[:5],
-            odds_data.get('market_odds', {}), market_ev
-        )
-        
-        humanized_interpretation = generate_humanized_interpretation(
-            home_team, away_team,
-            stats_data, historical_data,
-            market_probs, top_scores[:5], market_ev
+            totals_dist = np.convolve(home_probs, away_probs)
+    
+    # Ajustar com histórico
+    if use_history:
+        prob_matrix = adjust_probabilities_with_history(
+            prob_matrix, 
+            historical_data['match_results'],
+            weight=history_weight,
+            max_goals=max_goals
         )
-        
-        return {
-            'home_team': home_team,
-            'away_team': away_team,
-            'prob_matrix': prob_matrix,
-            'market_probs': market_probs,
-            'top_scores': top_scores,
-            'market_ev': market_ev,
-            'kelly_stakes': kelly_stakes,
-            'technical_report': technical_report,
-            'humanized_interpretation': humanized_interpretation,
-            'stats_data': stats_data,
-            'historical_data': historical_data,
-            'odds_data': odds_data,
-            'adjusted_home_expected_goals': adjusted_home_expected_goals,
-            'adjusted_away_expected_goals': adjusted_away_expected_goals
-        }
+    
+    # Calcular probabilidades de mercados
+    market_probs = calculate_market_probabilities(prob_matrix, totals_dist=totals_dist)
+    
+    # Encontrar placares mais prováveis (os recortes menores são fatias desta lista)
+    top_scores = find_most_probable_scores(prob_matrix)
+    
+    # Calcular valor esperado e Kelly
+    market_ev = {}
+    kelly_stakes = {}
+    if 'market_odds' in odds_data:
+        market_odds = odds_data['market_odds']
+        common = [m for m in market_odds if m in market_probs]
+        if common:
+            p = np.fromiter((market_probs[m] for m in common), dtype=np.float64, count=len(common))
+            o = np.fromiter((market_odds[m] for m in common), dtype=np.float64, count=len(common))
+            
+            # Valor esperado e Kelly (mesmas fórmulas de calculate_expected_value
+            # e calculate_kelly_criterion, aplicadas a todos os mercados de uma vez)
+            ev = p * o
+            with np.errstate(divide='ignore', invalid='ignore'):
+                edge = (ev - 1) / (o - 1)
+                kelly = np.where(edge > 0, edge / (o - 1) * kelly_fraction, 0.0)
+            
+            market_ev = dict(zip(common, ev.tolist()))
+            kelly_stakes = dict(zip(common, kelly.tolist()))
+    
+    # Gerar relatórios
+    technical_report = generate_technical_report(
+        home_team, away_team,
+        adjusted_home_expected_goals, adjusted_away_expected_goals,
+        prob_matrix, market_probs, top_scores[:5],
+        odds_data.get('market_odds', {}), market_ev
+    )
+    
+    humanized_interpretation = generate_humanized_interpretation(
+        home_team, away_team,
+        stats_data, historical_data,
+        market_probs, top_scores[:5], market_ev
+    )
+    
+    return {
+        'home_team': home_team,
+        'away_team': away_team,
+        'prob_matrix': prob_matrix,
+        'market_probs': market_probs,
+        'top_scores': top_scores,
+        'market_ev': market_ev,
+        'kelly_stakes': kelly_stakes,
+        'technical_report': technical_report,
+        'humanized_interpretation': humanized_interpretation,
+        'stats_data': stats_data,
+        'historical_data': historical_data,
+        'odds_data': odds_data,
+        'adjusted_home_expected_goals': adjusted_home_expected_goals,
+        'adjusted_away_expected_goals': adjusted_away_expected_goals
+    }
 
 def display_summary_tab(results, use_dixon_coles, history_weight):
     """
@@ -278,43 +287,37 @@ def display_summary_tab(results, use_dixon_coles, history_weight):
     # Mostrar probabilidades de mercados principais
     st.subheader("Probabilidades por Mercado")
     main_markets = ['1', 'X', '2', 'Over 2.5', 'Under 2.5', 'Ambas Marcam Sim', 'Ambas Marcam Não']
-    market_data = []
-    
-    for market in main_markets:
-        if market in results['market_probs']:
-            prob = results['market_probs'][market]
-            odd = results['odds_data'].get('market_odds', {}).get(market, "-")
-            ev = results['market_ev'].get(market, "-")
-            kelly = results['kelly_stakes'].get(market, "-")
-            
-            if isinstance(ev, (int, float)):
-                ev = f"{ev:.2f}"
-            if isinstance(kelly, (int, float)):
-                kelly = f"{kelly:.2%}"
-                
-            market_data.append([market, f"{prob:.2%}", odd, ev, kelly])
+    market_probs = results['market_probs']
+    market_odds = results['odds_data'].get('market_odds', {})
+    market_ev = results['market_ev']
+    kelly_stakes = results['kelly_stakes']
     
-    market_df = pd.DataFrame(market_data, columns=["Mercado", "Probabilidade", "Odd", "Valor Esperado", "Kelly"])
-    st.table(market_df)
+    # Tabelas numéricas; a formatação fica a cargo do Styler na renderização
+    table_format = {'Probabilidade': '{:.2%}', 'Odd': '{:.2f}', 'Valor Esperado': '{:.2f}', 'Kelly': '{:.2%}'}
+    
+    markets = [m for m in main_markets if m in market_probs]
+    market_df = pd.DataFrame({
+        'Mercado': markets,
+        'Probabilidade': [market_probs[m] for m in markets],
+        'Odd': [market_odds.get(m, np.nan) for m in markets],
+        'Valor Esperado': [market_ev.get(m, np.nan) for m in markets],
+        'Kelly': [kelly_stakes.get(m, np.nan) for m in markets]
+    })
+    st.table(market_df.style.format(table_format, na_rep='-'))
     
     # Mostrar apostas com valor
     st.subheader("Apostas com Melhor Valor")
-    value_bets = {k: v for k, v in results['market_ev'].items() if isinstance(v, (int, float)) and v > 1.0}
-    
-    if value_bets:
-        value_data = []
-        for market, ev in sorted(value_bets.items(), key=lambda x: x[1], reverse=True):
-            prob = results['market_probs'][market]
-            odd = results['odds_data'].get('market_odds', {}).get(market, "-")
-            kelly = results['kelly_stakes'].get(market, "-")
-            
-            if isinstance(kelly, (int, float)):
-                kelly = f"{kelly:.2%}"
-                
-            value_data.append([market, f"{prob:.2%}", odd, f"{ev:.2f}", kelly])
-        
-        value_df = pd.DataFrame(value_data, columns=["Mercado", "Probabilidade", "Odd", "Valor Esperado", "Kelly"])
-        st.table(value_df)
+    value_markets = sorted((m for m, ev in market_ev.items() if ev > 1.0), key=market_ev.get, reverse=True)
+    
+    if value_markets:
+        value_df = pd.DataFrame({
+            'Mercado': value_markets,
+            'Probabilidade': [market_probs[m] for m in value_markets],
+            'Odd': [market_odds.get(m, np.nan) for m in value_markets],
+            'Valor Esperado': [market_ev[m] for m in value_markets],
+            'Kelly': [kelly_stakes.get(m, np.nan) for m in value_markets]
+        })
+        st.table(value_df.style.format(table_format, na_rep='-'))
     else:
         st.info("Nenhuma aposta com valor positivo identificada.")
     
@@ -328,44 +331,56 @@ def display_summary_tab(results, use_dixon_coles, history_weight):
     # Botões de download
     st.subheader("Downloads")
     
-    # Criar figuras para download
-    matrix_fig = create_probability_matrix_heatmap(
-        results['prob_matrix'],
-        f"Probabilidades: {results['home_team']} vs {results['away_team']}"
-    )
+    # Criar figuras para download (reaproveitadas da aba de visualizações)
+    matrix_title = f"Probabilidades: {results['home_team']} vs {results['away_team']}"
+    matrix_fig = get_probability_matrix_figure(results['prob_matrix'], matrix_title)
     
-    scores_fig = create_most_probable_scores_chart(
-        results['top_scores'][:10],
-        f"Placares Mais Prováveis: {results['home_team']} vs {results['away_team']}"
-    )
+    scores_title = f"Placares Mais Prováveis: {results['home_team']} vs {results['away_team']}"
+    scores_fig = get_most_probable_scores_figure(results['top_scores'], scores_title)
     
-    market_fig = create_market_probabilities_chart(results['market_probs'])
+    market_fig = get_market_probabilities_figure(results['market_probs'])
     
-    # Links de download
+    # Botões de download: os PNGs só são gerados quando o usuário clica
+    # (data como função) e o clique não reexecuta o script, o que apagaria
+    # a análise exibida
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.markdown(get_image_download_link(matrix_fig, 'matriz_probabilidades.png', 'Download Matriz de Probabilidades'), unsafe_allow_html=True)
+        st.download_button("Download Matriz de Probabilidades",
+                           data=partial(get_figure_png, matrix_fig, 'matrix', (results['prob_matrix'], matrix_title)),
+                           file_name='matriz_probabilidades.png', mime='image/png', on_click='ignore')
     
     with col2:
-        st.markdown(get_image_download_link(scores_fig, 'placares_provaveis.png', 'Download Placares Prováveis'), unsafe_allow_html=True)
+        st.download_button("Download Placares Prováveis",
+                           data=partial(get_figure_png, scores_fig, 'scores', (results['top_scores'], scores_title)),
+                           file_name='placares_provaveis.png', mime='image/png', on_click='ignore')
     
     with col3:
-        st.markdown(get_image_download_link(market_fig, 'probabilidades_mercados.png', 'Download Probabilidades por Mercado'), unsafe_allow_html=True)
+        st.download_button("Download Probabilidades por Mercado",
+                           data=partial(get_figure_png, market_fig, 'market', (results['market_probs'],)),
+                           file_name='probabilidades_mercados.png', mime='image/png', on_click='ignore')
     
     # Download dos relatórios
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown(get_markdown_download_link(results['technical_report'], 'relatorio_tecnico.md', 'Download Relatório Técnico'), unsafe_allow_html=True)
+        st.download_button("Download Relatório Técnico", data=results['technical_report'].encode(),
+                           file_name='relatorio_tecnico.md', mime='text/markdown', on_click='ignore')
     
     with col2:
-        st.markdown(get_markdown_download_link(results['humanized_interpretation'], 'interpretacao_humanizada.md', 'Download Interpretação Humanizada'), unsafe_allow_html=True)
+        st.download_button("Download Interpretação Humanizada", data=results['humanized_interpretation'].encode(),
+                           file_name='interpretacao_humanizada.md', mime='text/markdown', on_click='ignore')
 
 def display_visualizations_tab(results):
     """
     Exibe a aba de visualizações com gráficos detalhados
     """
+    from visualizer import (
+        create_historical_comparison_chart,
+        create_expected_value_chart,
+        create_team_comparison_chart
+    )
+    
     st.header("Visualizações")
     
     col1, col2 = st.columns(2)
@@ -373,7 +388,7 @@ def display_visualizations_tab(results):
     with col1:
         # Matriz de probabilidades
         st.subheader("Matriz de Probabilidades de Placares")
-        matrix_fig = create_probability_matrix_heatmap(
+        matrix_fig = get_probability_matrix_figure(
             results['prob_matrix'],
             f"Probabilidades: {results['home_team']} vs {results['away_team']}"
         )
@@ -382,41 +397,43 @@ def display_visualizations_tab(results):
     with col2:
         # Placares mais prováveis
         st.subheader("Placares Mais Prováveis")
-        scores_fig = create_most_probable_scores_chart(
-            results['top_scores'][:10],
+        scores_fig = get_most_probable_scores_figure(
+            results['top_scores'],
             f"Placares Mais Prováveis: {results['home_team']} vs {results['away_team']}"
         )
         st.pyplot(scores_fig)
     
     # Probabilidades por mercado
     st.subheader("Probabilidades por Mercado")
-    market_fig = create_market_probabilities_chart(results['market_probs'])
+    market_fig = get_market_probabilities_figure(results['market_probs'])
     st.pyplot(market_fig)
     
+    # Os gráficos abaixo não são reaproveitados: chegam já rasterizados em PNG,
+    # sem manter as figuras do matplotlib em memória
+    
     # Valor esperado por mercado
     st.subheader("Valor Esperado por Mercado")
-    ev_fig = create_expected_value_chart(results['market_ev'])
-    st.pyplot(ev_fig)
+    st.image(create_expected_value_chart(results['market_ev']))
     
     # Se houver dados históricos suficientes
     if results['historical_data'] and 'common_scores' in results['historical_data']:
         st.subheader("Placares Históricos Mais Comuns")
-        hist_fig = create_historical_comparison_chart(
+        hist_png = create_historical_comparison_chart(
             results['historical_data'],
             f"Placares Históricos: {results['home_team']} vs {results['away_team']}"
         )
-        st.pyplot(hist_fig)
+        st.image(hist_png)
     
     # Se houver dados estatísticos suficientes para comparação
     if (results['stats_data'] and 
         any(k in results['stats_data'] for k in ['gols_marcados_casa', 'gols_marcados_fora'])):
         st.subheader("Comparação entre Times")
-        team_fig = create_team_comparison_chart(
+        team_png = create_team_comparison_chart(
             results['stats_data'],
             results['home_team'],
             results['away_team']
         )
-        st.pyplot(team_fig)
+        st.image(team_png)
 
 def display_technical_report_tab(results):
     """
@@ -482,26 +499,45 @@ def display_example_usage():
     st.subheader("Exemplo de Análise")
     st.image("https://i.imgur.com/XYZ123.png", caption="Exemplo de visualização de probabilidades de placares")
 
-# Função para converter figura matplotlib para imagem base64
-def get_image_download_link(fig, filename, text):
+# Figuras reaproveitadas entre execuções (objetos Figure não são serializáveis,
+# por isso cache_resource em vez de cache_data)
+@st.cache_resource(max_entries=32)
+def get_probability_matrix_figure(prob_matrix, title):
     """
-    Gera um link para download de uma figura matplotlib
+    Retorna o heatmap da matriz de probabilidades, criando-o apenas uma vez
     """
-    buf = BytesIO()
-    fig.savefig(buf, format='png', dpi=300, bbox_inches='tight')
-    buf.seek(0)
-    b64 = base64.b64encode(buf.read()).decode()
-    href = f'<a href="data:image/png;base64,{b64}" download="{filename}">{text}</a>'
-    return href
+    from visualizer import create_probability_matrix_heatmap
+    return create_probability_matrix_heatmap(prob_matrix, title, return_fig=True)
 
-# Função para gerar arquivo markdown para download
-def get_markdown_download_link(markdown_text, filename, link_text):
+@st.cache_resource(max_entries=32)
+def get_most_probable_scores_figure(scores, title):
     """
-    Gera um link para download de texto markdown
+    Retorna o gráfico de placares mais prováveis, criando-o apenas uma vez
     """
-    b64 = base64.b64encode(markdown_text.encode()).decode()
-    href = f'<a href="data:file/markdown;base64,{b64}" download="{filename}">{link_text}</a>'
-    return href
+    from visualizer import create_most_probable_scores_chart
+    return create_most_probable_scores_chart(scores, title, return_fig=True)
+
+@st.cache_resource(max_entries=32)
+def get_market_probabilities_figure(probabilities):
+    """
+    Retorna o gráfico de probabilidades por mercado, criando-o apenas uma vez
+    """
+    from visualizer import create_market_probabilities_chart
+    return create_market_probabilities_chart(probabilities, return_fig=True)
+
+# Função para converter figura matplotlib em PNG para download
+@st.cache_data(show_spinner=False, max_entries=32)
+def get_figure_png(_fig, chart, chart_args):
+    """
+    Renderiza uma figura matplotlib em PNG, reaproveitando o resultado entre
+    execuções. A chave é o tipo de gráfico mais os mesmos argumentos da função
+    que criou a figura (id() seria reutilizado após o descarte de figuras do cache)
+    """
+    from io import BytesIO
+    
+    buf = BytesIO()
+    _fig.savefig(buf, format='png', dpi=300, bbox_inches='tight')
+    return buf.getvalue()
 
 if __name__ == "__main__":
     main()
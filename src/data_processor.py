@@ -1,47 +1,102 @@
 import re
-import pandas as pd
+import sys
 import numpy as np
 from datetime import datetime
 
-def process_odds_text(odds_text):
+# Padrão para extrair data e resultado
+# Formato esperado: "21/12/2024, Time A 5-1 Time B"
+_HIST_RE = re.compile(r'(\d{2}/\d{2}/\d{4}),\s*(.*?)\s+(\d+)-(\d+)\s+(.*)')
+
+# Maior número de gols aceito por jogo: mantém somas e chaves de placar dentro do int64
+_MAX_GOALS = np.iinfo(np.int32).max
+
+# Normalização das chaves de estatísticas ("Gols Marcados Casa" -> "gols_marcados_casa")
+_KEY_TBL = str.maketrans(' ', '_')
+
+# Padrões comuns para identificar confrontos
+_TEAM_RES = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'([A-Za-z\s]+)\s+vs\s+([A-Za-z\s]+)',
+        r'([A-Za-z\s]+)\s+x\s+([A-Za-z\s]+)',
+        r'([A-Za-z\s]+)\s+-\s+([A-Za-z\s]+)'
+    )
+]
+
+def _aggregate_scores(hg, ag):
     """
-    Processa texto contendo odds de diferentes mercados.
+    Agrega os gols do histórico em contagens de resultados e frequência de placares
     
     Args:
-        odds_text (str): Texto com odds no formato "mercado, odd" por linha
+        hg: Array numpy com os gols do time da casa em cada jogo
+        ag: Array numpy com os gols do time de fora em cada jogo
         
     Returns:
-        dict: Dicionário com dados processados das odds
+        tuple: (contagens, gols_casa, gols_fora, frequencias, primeira_ocorrencia), onde
+        contagens = (vitórias casa, empates, vitórias fora, ambas marcam, over 2.5,
+        soma gols casa, soma gols fora) e as demais são arrays alinhados por placar
     """
-    if not odds_text:
-        return {'market_odds': {}}
+    total = hg + ag
+    totals = (
+        int((hg > ag).sum()),
+        int((hg == ag).sum()),
+        int((hg < ag).sum()),
+        int(((hg > 0) & (ag > 0)).sum()),
+        int((total > 2).sum()),
+        int(hg.sum()),
+        int(ag.sum())
+    )
+    # Chave única por placar derivada das dimensões reais (sem colisões)
+    dims = (int(hg.max()) + 1, int(ag.max()) + 1)
+    keys, first_idx, counts = np.unique(np.ravel_multi_index((hg, ag), dims), return_index=True, return_counts=True)
+    score_home, score_away = np.unravel_index(keys, dims)
+    return totals, score_home, score_away, counts, first_idx
+
+def _parse_odds_lines(odds_text):
+    """
+    Extrai os pares (mercado, odd) de um texto no formato "mercado, odd" por linha
     
-    lines = odds_text.strip().split('\n')
-    market_odds = {}
+    Args:
+        odds_text (str): Texto com odds
+        
+    Returns:
+        list: Lista de tuplas (mercado, odd) na ordem do texto
+    """
+    pairs = []
     
-    for line in lines:
-        if ',' not in line:
+    for line in odds_text.splitlines():
+        market, sep, odd = line.partition(',')
+        if not sep:
             continue
-            
-        parts = line.split(',', 1)
-        if len(parts) != 2:
-            continue
-            
-        market = parts[0].strip()
+        
+        # float() já ignora espaços ao redor do número
         try:
-            odd = float(parts[1].strip())
-            market_odds[market] = odd
+            pairs.append((market.strip(), float(odd)))
         except ValueError:
             continue
     
-    # Calcular probabilidades implícitas
-    implied_probs = {}
-    for market, odd in market_odds.items():
-        implied_probs[market] = 1 / odd if odd > 0 else 0
+    return pairs
+
+def process_odds_pairs(pairs):
+    """
+    Processa odds já separadas em pares, sem nenhum tratamento de texto.
+    
+    Args:
+        pairs: Iterável de tuplas (mercado, odd); mercados repetidos mantêm a última odd
+        
+    Returns:
+        dict: Dicionário com dados processados das odds
+    """
+    market_odds = dict(pairs)
+    
+    # Calcular probabilidades implícitas (uma única operação vetorizada)
+    odds = np.fromiter(market_odds.values(), dtype=np.float64, count=len(market_odds))
+    with np.errstate(divide='ignore'):
+        inv = np.where(odds > 0, 1.0 / odds, 0.0)
+    implied_probs = dict(zip(market_odds, inv.tolist()))
     
     # Calcular overround para mercados 1X2
     overround = 0
-    if '1' in implied_probs and 'X' in implied_probs and '2' in implied_probs:
+    if all(k in implied_probs for k in ('1', 'X', '2')):
         overround = implied_probs['1'] + implied_probs['X'] + implied_probs['2'] - 1
     
     return {
@@ -50,12 +105,51 @@ def process_odds_text(odds_text):
         'overround': overround
     }
 
-def process_historical_matches_text(historical_text):
+def process_odds_text(odds_text):
+    """
+    Processa texto contendo odds de diferentes mercados.
+    
+    Args:
+        odds_text (str): Texto com odds no formato "mercado, odd" por linha
+        
+    Returns:
+        dict: Dicionário com dados processados das odds
+    """
+    if not odds_text:
+        return {'market_odds': {}}
+    
+    return process_odds_pairs(_parse_odds_lines(odds_text))
+
+def process_odds_batch(odds_texts):
+    """
+    Processa as odds de vários jogos de uma vez (ex.: uma rodada inteira).
+    
+    Args:
+        odds_texts: Iterável de textos com odds no formato "mercado, odd" por linha
+        
+    Returns:
+        list: Lista com o resultado de process_odds_text para cada texto
+    """
+    results = []
+    
+    for odds_text in odds_texts:
+        if not odds_text:
+            results.append({'market_odds': {}})
+            continue
+        
+        # Nomes de mercado internados: jogos da mesma rodada compartilham as chaves
+        pairs = [(sys.intern(market), odd) for market, odd in _parse_odds_lines(odds_text)]
+        results.append(process_odds_pairs(pairs))
+    
+    return results
+
+def process_historical_matches_text(historical_text, include_matches=True):
     """
     Processa texto contendo histórico de confrontos entre times.
     
     Args:
         historical_text (str): Texto com histórico de jogos
+        include_matches (bool): Se True, inclui a lista detalhada de jogos ('matches')
         
     Returns:
         dict: Dicionário com dados processados do histórico
@@ -64,80 +158,103 @@ def process_historical_matches_text(historical_text):
         return {}
     
     lines = historical_text.strip().split('\n')
-    matches = []
     
-    # Padrão para extrair data e resultado
-    # Formato esperado: "21/12/2024, Time A 5-1 Time B"
-    pattern = r'(\d{2}/\d{2}/\d{4}),\s*(.*?)\s+(\d+)-(\d+)\s+(.*)'
+    # Colunas paralelas (struct-of-arrays) preenchidas durante o parsing
+    dates = []
+    home_teams = []
+    away_teams = []
+    home_goals_list = []
+    away_goals_list = []
+    
+    # Datas já convertidas nesta chamada (históricos costumam repetir datas)
+    date_cache = {}
     
     for line in lines:
-        match = re.match(pattern, line)
+        match = _HIST_RE.match(line)
         if match:
             date_str, home_team, home_goals, away_goals, away_team = match.groups()
             
             try:
-                date = datetime.strptime(date_str, '%d/%m/%Y')
+                # O regex garante o formato dd/mm/aaaa, então basta fatiar a string
+                date = date_cache.get(date_str)
+                if date is None:
+                    date = date_cache[date_str] = datetime(int(date_str[6:10]), int(date_str[3:5]), int(date_str[0:2]))
                 home_goals = int(home_goals)
                 away_goals = int(away_goals)
-                
-                matches.append({
-                    'date': date,
-                    'home_team': home_team.strip(),
-                    'away_team': away_team.strip(),
-                    'home_goals': home_goals,
-                    'away_goals': away_goals,
-                    'total_goals': home_goals + away_goals,
-                    'goal_diff': home_goals - away_goals,
-                    'result': 'H' if home_goals > away_goals else ('D' if home_goals == away_goals else 'A'),
-                    'both_scored': home_goals > 0 and away_goals > 0,
-                    'over_2_5': (home_goals + away_goals) > 2.5
-                })
+                if home_goals > _MAX_GOALS or away_goals > _MAX_GOALS:
+                    raise ValueError("Número de gols fora do intervalo suportado")
             except (ValueError, TypeError):
                 continue
+            
+            dates.append(date)
+            home_teams.append(home_team)
+            away_teams.append(away_team)
+            home_goals_list.append(home_goals)
+            away_goals_list.append(away_goals)
     
     # Se não houver jogos válidos, retornar dicionário vazio
-    if not matches:
+    total_matches = len(home_goals_list)
+    if not total_matches:
         return {}
     
-    # Calcular estatísticas do histórico
-    total_matches = len(matches)
-    home_wins = sum(1 for m in matches if m['result'] == 'H')
-    draws = sum(1 for m in matches if m['result'] == 'D')
-    away_wins = sum(1 for m in matches if m['result'] == 'A')
-    
-    both_scored = sum(1 for m in matches if m['both_scored'])
-    over_2_5 = sum(1 for m in matches if m['over_2_5'])
-    
-    avg_home_goals = sum(m['home_goals'] for m in matches) / total_matches
-    avg_away_goals = sum(m['away_goals'] for m in matches) / total_matches
-    avg_total_goals = sum(m['total_goals'] for m in matches) / total_matches
+    hg = np.fromiter(home_goals_list, dtype=np.int64, count=total_matches)
+    ag = np.fromiter(away_goals_list, dtype=np.int64, count=total_matches)
     
-    # Extrair resultados para ajuste de probabilidades
-    match_results = [(m['home_goals'], m['away_goals']) for m in matches]
+    (home_wins, draws, away_wins, both_scored, over_2_5, sum_home, sum_away), \
+        score_home, score_away, counts, first_idx = _aggregate_scores(hg, ag)
     
-    # Contar frequência de placares
-    score_counts = {}
-    for m in matches:
-        score = f"{m['home_goals']}-{m['away_goals']}"
-        score_counts[score] = score_counts.get(score, 0) + 1
-    
-    # Ordenar placares por frequência
-    common_scores = sorted(score_counts.items(), key=lambda x: x[1], reverse=True)
+    # Frequência de placares: empates na contagem resolvidos pela ordem de
+    # primeira ocorrência no histórico
+    top = np.lexsort((first_idx, -counts))[:5]
+    common_scores = [
+        (f"{h}-{a}", count)
+        for h, a, count in zip(score_home[top].tolist(), score_away[top].tolist(), counts[top].tolist())
+    ]
     
-    return {
-        'matches': matches,
+    historical_data = {
         'total_matches': total_matches,
-        'home_wins_pct': home_wins / total_matches if total_matches > 0 else 0,
-        'draws_pct': draws / total_matches if total_matches > 0 else 0,
-        'away_wins_pct': away_wins / total_matches if total_matches > 0 else 0,
-        'both_scored_pct': both_scored / total_matches if total_matches > 0 else 0,
-        'over_2_5_pct': over_2_5 / total_matches if total_matches > 0 else 0,
-        'avg_home_goals': avg_home_goals,
-        'avg_away_goals': avg_away_goals,
-        'avg_total_goals': avg_total_goals,
-        'match_results': match_results,
-        'common_scores': common_scores[:5]  # Top 5 placares mais comuns
+        'home_wins_pct': home_wins / total_matches,
+        'draws_pct': draws / total_matches,
+        'away_wins_pct': away_wins / total_matches,
+        'both_scored_pct': both_scored / total_matches,
+        'over_2_5_pct': over_2_5 / total_matches,
+        'avg_home_goals': sum_home / total_matches,
+        'avg_away_goals': sum_away / total_matches,
+        'avg_total_goals': (sum_home + sum_away) / total_matches,
+        # Placares como array Nx2 (gols_casa, gols_fora), no lugar de uma lista de tuplas
+        'match_results': np.column_stack((hg, ag)),
+        'common_scores': common_scores
     }
+    
+    # Dicionários por jogo só são montados quando solicitados
+    if include_matches:
+        historical_data['matches'] = [
+            {
+                'date': date,
+                'home_team': home_team.strip(),
+                'away_team': away_team.strip(),
+                'home_goals': h,
+                'away_goals': a,
+                'total_goals': h + a,
+                'goal_diff': h - a,
+                'result': 'H' if h > a else ('D' if h == a else 'A'),
+                'both_scored': h > 0 and a > 0,
+                'over_2_5': (h + a) > 2.5
+            }
+            for date, home_team, away_team, h, a in zip(dates, home_teams, away_teams, home_goals_list, away_goals_list)
+        ]
+    
+    return historical_data
+
+def _first(d, keys, default):
+    """
+    Retorna o valor da primeira chave presente em d, ou default se nenhuma existir
+    """
+    for key in keys:
+        value = d.get(key)
+        if value is not None:
+            return value
+    return default
 
 def process_statistics_text(statistics_text):
     """
@@ -152,16 +269,15 @@ def process_statistics_text(statistics_text):
     if not statistics_text:
         return {}
     
-    lines = statistics_text.strip().split('\n')
     stats = {}
     
     # Processar cada linha no formato "chave: valor"
-    for line in lines:
-        if ':' not in line:
+    for line in statistics_text.splitlines():
+        key, sep, value = line.partition(':')
+        if not sep:
             continue
-            
-        key, value = line.split(':', 1)
-        key = key.strip().lower().replace(' ', '_')
+        
+        key = key.strip().lower().translate(_KEY_TBL)
         value = value.strip()
         
         # Tentar converter para número se possível
@@ -173,27 +289,17 @@ def process_statistics_text(statistics_text):
         except ValueError:
             stats[key] = value
     
-    # Extrair e calcular métricas importantes
-    home_team = stats.get('time_da_casa', stats.get('home_team', 'Time da Casa'))
-    away_team = stats.get('time_visitante', stats.get('away_team', 'Time Visitante'))
+    # Extrair e calcular métricas importantes (atribuídas diretamente em stats)
+    stats['home_team'] = _first(stats, ('time_da_casa', 'home_team'), 'Time da Casa')
+    stats['away_team'] = _first(stats, ('time_visitante', 'away_team'), 'Time Visitante')
     
     # Gols esperados baseados nas estatísticas
-    home_expected_goals = stats.get('gols_marcados_casa', stats.get('home_expected_goals', 1.5))
-    away_expected_goals = stats.get('gols_marcados_fora', stats.get('away_expected_goals', 1.0))
+    stats['home_expected_goals'] = _first(stats, ('gols_marcados_casa', 'home_expected_goals'), 1.5)
+    stats['away_expected_goals'] = _first(stats, ('gols_marcados_fora', 'away_expected_goals'), 1.0)
     
     # Posições na tabela
-    home_position = stats.get('posicao_casa', stats.get('home_position', 10))
-    away_position = stats.get('posicao_fora', stats.get('away_position', 10))
-    
-    # Adicionar informações calculadas
-    stats.update({
-        'home_team': home_team,
-        'away_team': away_team,
-        'home_expected_goals': home_expected_goals,
-        'away_expected_goals': away_expected_goals,
-        'home_position': home_position,
-        'away_position': away_position
-    })
+    stats['home_position'] = _first(stats, ('posicao_casa', 'home_position'), 10)
+    stats['away_position'] = _first(stats, ('posicao_fora', 'away_position'), 10)
     
     return stats
 
@@ -207,15 +313,8 @@ def extract_team_names(text):
     Returns:
         tuple: (time_casa, time_fora) ou (None, None) se não encontrados
     """
-    # Padrões comuns para identificar confrontos
-    patterns = [
-        r'([A-Za-z\s]+)\s+vs\s+([A-Za-z\s]+)',
-        r'([A-Za-z\s]+)\s+x\s+([A-Za-z\s]+)',
-        r'([A-Za-z\s]+)\s+-\s+([A-Za-z\s]+)'
-    ]
-    
-    for pattern in patterns:
-        matches = re.search(pattern, text, re.IGNORECASE)
+    for pattern in _TEAM_RES:
+        matches = pattern.search(text)
         if matches:
             return matches.group(1).strip(), matches.group(2).strip()
     
@@ -1,7 +1,149 @@
+import os
 import re
+import string
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+
+# Padrões que começam por um número usam (?<!\d): se a busca falha no primeiro
+# dígito de uma sequência, falharia também em cada dígito seguinte, então essas
+# tentativas (quadráticas em textos com muitos números) são descartadas de saída
+
+# Padrões para identificar confrontos
+_TEAM_NAME_RES = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'([A-Za-z\s]+)\s+x\s+([A-Za-z\s]+)',
+        r'([A-Za-z\s]+)\s+vs\s+([A-Za-z\s]+)',
+        r'([A-Za-z\s]+)\s+-\s+([A-Za-z\s]+)'
+    )
+]
+# Separadores literais do caminho rápido, na mesma ordem dos padrões acima, e
+# os caracteres ASCII de [A-Za-z\s]
+_TEAM_SEPS = (' x ', ' vs ', ' - ')
+_NAME_CHARS = string.ascii_letters + string.whitespace
+_HOME_TEAM_RE = re.compile(r'Time da Casa:?\s*([A-Za-z\s]+)', re.IGNORECASE)
+_AWAY_TEAM_RE = re.compile(r'Time Visitante:?\s*([A-Za-z\s]+)', re.IGNORECASE)
+
+# Odds 1X2 ("odds para vitória: 1.56", "vitória ... 1.56" e "1.56 para vitória")
+_HOME_WIN_RE = re.compile(r'odds para vitória.*?(\d+[.,]\d+)', re.IGNORECASE)
+_DRAW_RE = re.compile(r'odds para empate.*?(\d+[.,]\d+)', re.IGNORECASE)
+_AWAY_WIN_RE = re.compile(r'odds para vitória do visitante.*?(\d+[.,]\d+)', re.IGNORECASE)
+_HOME_WIN_ALT_RE = re.compile(r'vitória.*?(\d+[.,]\d+)', re.IGNORECASE)
+_DRAW_ALT_RE = re.compile(r'empate.*?(\d+[.,]\d+)', re.IGNORECASE)
+_AWAY_WIN_ALT_RE = re.compile(r'vitória do.*?visitante.*?(\d+[.,]\d+)', re.IGNORECASE)
+_HOME_WIN_PREFIX_RE = re.compile(r'(?<!\d)(\d+[.,]\d+).*?vitória', re.IGNORECASE)
+_DRAW_PREFIX_RE = re.compile(r'(?<!\d)(\d+[.,]\d+).*?empate', re.IGNORECASE)
+_AWAY_WIN_PREFIX_RE = re.compile(r'(?<!\d)(\d+[.,]\d+).*?vitória do.*?visitante', re.IGNORECASE)
+_ODDS_NUM_RE = re.compile(r'(?<!\d)(\d+[.,]\d+)')
+
+# Odds Over/Under
+_OVER_RE = re.compile(r'[Oo]ver\s+(\d+[.,]\d+).*?(\d+[.,]\d+)')
+_UNDER_RE = re.compile(r'[Uu]nder\s+(\d+[.,]\d+).*?(\d+[.,]\d+)')
+_DECIMAL_TBL = str.maketrans(',', '.')
+_OVER_25_RE = re.compile(r'[Oo]ver\s+2[.,]5.*?(\d+[.,]\d+)')
+
+# Odds BTTS (Ambas Marcam): "principal|alternativo", com o valor no grupo 1 ou 2
+# (ver _search_either para a prioridade entre os dois)
+_BTTS_YES_RE = re.compile(r'[Aa]mbas\s+[Mm]arcam\s+[Ss]im.*?(\d+[.,]\d+)|BTTS.*?[Ss]im.*?(\d+[.,]\d+)')
+_BTTS_NO_RE = re.compile(r'[Aa]mbas\s+[Mm]arcam\s+[Nn]ão.*?(\d+[.,]\d+)|BTTS.*?[Nn]ão.*?(\d+[.,]\d+)')
+
+# Palavras-âncora localizadas em uma única varredura do texto; os padrões acima só
+# são executados quando a âncora correspondente aparece. As buscas são de largura
+# zero (lookahead) para que uma âncora nunca esconda outra sobreposta a ela
+_ODDS_ANCHORS_RE = re.compile(
+    r'(?=(?P<vitoria>vitória)|(?P<empate>empate)|(?P<over>over)|(?P<under>under)|(?P<ambas>ambas)|(?P<btts>btts))',
+    re.IGNORECASE
+)
+
+# Confrontos diretos
+_TOTAL_MATCHES_RE = re.compile(r'(?<!\d)(\d+)\s*[Jj]ogos')
+_H2H_HOME_WINS_RE = re.compile(r'(?<!\d)(\d+)%.*?[Vv]itórias')
+_H2H_DRAWS_RE = re.compile(r'(?<!\d)(\d+)%.*?[Ee]mpates')
+_H2H_AWAY_WINS_RE = re.compile(r'(?<!\d)(\d+)%.*?[Dd]errotas')
+_H2H_OVER_15_RE = re.compile(r'(?<!\d)(\d+)%\s*[Mm]ais\s*de\s*1[.,]5')
+_H2H_OVER_25_RE = re.compile(r'(?<!\d)(\d+)%\s*[Mm]ais\s*de\s*2[.,]5')
+_H2H_OVER_35_RE = re.compile(r'(?<!\d)(\d+)%\s*[Mm]ais\s*de\s*3[.,]5')
+_H2H_BTTS_RE = re.compile(r'(?<!\d)(\d+)%\s*AM')  # AM = Ambas Marcam
+_RECENT_MATCHES_RE = re.compile(r'(\d{2}/\d{2}\s+\d{4})\s+([A-Za-z\s]+)\s*(\d+)\s*([A-Za-z\s]+)\s*(\d+)')
+_H2H_ANCHORS_RE = re.compile(
+    r'(?=(?P<jogos>jogos)|(?P<vitorias>vitórias)|(?P<empates>empates)|(?P<derrotas>derrotas)|(?P<mais>mais)|(?P<am>am))',
+    re.IGNORECASE
+)
+
+# Modelos das estatísticas por time; {team} recebe o nome do time escapado
+_TEAM_TEMPLATES = {
+    'ppg': r'(?<!\d)(\d+[.,]\d+).*?[Pp]ontos\s*por\s*jogo.*?{team}',
+    'ppg_alt': r'{team}.*?(\d+[.,]\d+).*?[Pp]PJ',
+    'wins': r'(?<!\d)(\d+)%.*?[Vv]itória.*?{team}',
+    'wins_alt': r'{team}.*?[Vv]itória.*?(\d+)%',
+    'scored': r'(?<!\d)(\d+[.,]\d+).*?[Gg]ols\s*[Mm]arcados.*?{team}',
+    'conceded': r'(?<!\d)(\d+[.,]\d+).*?[Gg]ols\s*[Ss]ofridos.*?{team}',
+    'scored_alt': r'{team}.*?(\d+[.,]\d+).*?[Gg]ols\s*\/\s*[Jj]ogo',
+    'clean_sheets': r'(?<!\d)(\d+)%.*?[Cc]lean\s*[Ss]heets.*?{team}',
+    'xg': r'xG.*?(\d+[.,]\d+).*?{team}'
+}
+
+def _find_anchors(anchors_re, text):
+    """
+    Percorre o texto uma única vez e retorna as âncoras encontradas
+    
+    Args:
+        anchors_re (re.Pattern): Alternação de âncoras com grupos nomeados
+        text (str): Texto contendo estatísticas de futebol
+        
+    Returns:
+        set: Nomes dos grupos (âncoras) presentes no texto
+    """
+    return {m.lastgroup for m in anchors_re.finditer(text)}
+
+def _search(pattern, text, present):
+    """
+    Executa pattern.search(text) apenas se a âncora do padrão estiver presente
+    """
+    return pattern.search(text) if present else None
+
+def _search_either(pattern, text, present=True):
+    """
+    Busca um padrão "principal|alternativo" (valor no grupo 1 ou 2) com a mesma
+    prioridade de `principal.search(text) or alternativo.search(text)`
+    
+    Args:
+        pattern (re.Pattern): Alternação compilada dos dois padrões
+        text (str): Texto contendo estatísticas de futebol
+        present (bool): Se False, as âncoras não estão no texto e a busca é pulada
+        
+    Returns:
+        str: Valor capturado, ou None se nenhum dos padrões for encontrado
+    """
+    if not present:
+        return None
+    
+    # Uma varredura costuma bastar; só quando o alternativo aparece antes é
+    # preciso continuar procurando o principal depois daquela posição
+    match = pattern.search(text)
+    fallback = None
+    while match is not None and match.start(1) == -1:
+        if fallback is None:
+            fallback = match.group(2)
+        match = pattern.search(text, match.start() + 1)
+    
+    return match.group(1) if match is not None else fallback
+
+@lru_cache(maxsize=64)
+def _team_patterns(team):
+    """
+    Compila, uma única vez por time, todos os padrões de estatísticas que contêm o seu nome
+    
+    Args:
+        team (str): Nome do time
+        
+    Returns:
+        dict: Padrões compilados, com as mesmas chaves de _TEAM_TEMPLATES
+    """
+    escaped = re.escape(team)
+    return {key: re.compile(template.format(team=escaped)) for key, template in _TEAM_TEMPLATES.items()}
 
 def extract_football_stats_from_text(text):
     """
@@ -37,11 +179,74 @@ def extract_football_stats_from_text(text):
     # Extrair estatísticas dos times
     extracted_data['team_stats'] = extract_team_stats(text, teams)
     
-    # Extrair previsões para a partida
-    extracted_data['match_predictions'] = extract_match_predictions(text)
+    # 'match_predictions' permanece vazio: não há extrator de previsões neste módulo
     
     return extracted_data
 
+def extract_football_stats_batch(texts, max_workers=None):
+    """
+    Extrai estatísticas de futebol de vários textos em paralelo.
+    
+    Args:
+        texts: Iterável de textos contendo estatísticas de futebol
+        max_workers (int): Número máximo de processos (padrão: número de CPUs)
+        
+    Returns:
+        list: Resultado de extract_football_stats_from_text para cada texto, na mesma ordem
+    """
+    texts = list(texts)
+    
+    # O módulo re não libera o GIL, então o paralelismo é feito com processos
+    # (um texto por tarefa); para poucos textos não compensa iniciá-los
+    if len(texts) < 2 or max_workers == 1:
+        return [extract_football_stats_from_text(text) for text in texts]
+    
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(texts) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(extract_football_stats_from_text, texts, chunksize=chunksize))
+
+def _split_team_names(text):
+    """
+    Caminho rápido de extract_team_names para textos como "Arsenal x Chelsea".
+    
+    Só devolve os nomes quando o resultado é garantidamente o mesmo das regex
+    de _TEAM_NAME_RES; em qualquer caso ambíguo devolve None.
+    
+    Args:
+        text (str): Texto contendo estatísticas de futebol
+        
+    Returns:
+        tuple: (time_casa, time_visitante) ou None
+    """
+    words = None
+    for i, sep in enumerate(_TEAM_SEPS):
+        left, found, right = text.partition(sep)
+        if not found:
+            continue
+        
+        # Um padrão anterior poderia casar em outro ponto do texto
+        if i:
+            if words is None:
+                words = {w.casefold() for w in text.split()}
+            if any(prev.strip() in words for prev in _TEAM_SEPS[:i]):
+                return None
+        
+        # A regex começa no início do texto e o nome de fora vai até o primeiro
+        # caractere fora de [A-Za-z\s]; espaços e letras não ASCII ficam com a regex
+        rest = right.lstrip(_NAME_CHARS)
+        if not left or left.lstrip(_NAME_CHARS) or (rest and (rest[0].isspace() or not rest[0].isascii())):
+            return None
+        
+        # Um segundo separador dentro do nome de fora mudaria o ponto de corte
+        away = right[:len(right) - len(rest)]
+        if not away or sep.strip() in {w.casefold() for w in away.split()}:
+            return None
+        
+        return left.strip(), away.strip()
+    
+    return None
+
 def extract_team_names(text):
     """
     Extrai os nomes dos times do texto.
@@ -52,23 +257,20 @@ def extract_team_names(text):
     Returns:
         tuple: (time_casa, time_visitante) ou (None, None) se não encontrados
     """
-    # Padrões para identificar confrontos
-    patterns = [
-        r'([A-Za-z\s]+)\s+x\s+([A-Za-z\s]+)',
-        r'([A-Za-z\s]+)\s+vs\s+([A-Za-z\s]+)',
-        r'([A-Za-z\s]+)\s+-\s+([A-Za-z\s]+)'
-    ]
+    teams = _split_team_names(text)
+    if teams:
+        return teams
     
-    for pattern in patterns:
-        matches = re.search(pattern, text, re.IGNORECASE)
+    for pattern in _TEAM_NAME_RES:
+        matches = pattern.search(text)
         if matches:
             return matches.group(1).strip(), matches.group(2).strip()
     
     # Tentar encontrar em outros formatos comuns
     try:
         # Procurar por padrões como "Time da Casa: Arsenal"
-        home_match = re.search(r'Time da Casa:?\s*([A-Za-z\s]+)', text, re.IGNORECASE)
-        away_match = re.search(r'Time Visitante:?\s*([A-Za-z\s]+)', text, re.IGNORECASE)
+        home_match = _HOME_TEAM_RE.search(text)
+        away_match = _AWAY_TEAM_RE.search(text)
         
         if home_match and away_match:
             return home_match.group(1).strip(), away_match.group(1).strip()
@@ -88,45 +290,43 @@ def extract_odds(text):
         dict: Dicionário com as odds extraídas
     """
     odds = {}
+    anchors = _find_anchors(_ODDS_ANCHORS_RE, text)
+    has_win = 'vitoria' in anchors
+    has_draw = 'empate' in anchors
     
     # Extrair odds 1X2
     try:
         # Procurar por padrões como "odds para vitória: 1.56"
-        home_win = re.search(r'odds para vitória.*?(\d+[.,]\d+)', text, re.IGNORECASE)
-        draw = re.search(r'odds para empate.*?(\d+[.,]\d+)', text, re.IGNORECASE)
-        away_win = re.search(r'odds para vitória do visitante.*?(\d+[.,]\d+)', text, re.IGNORECASE)
+        home_win = _search(_HOME_WIN_RE, text, has_win)
+        draw = _search(_DRAW_RE, text, has_draw)
+        away_win = _search(_AWAY_WIN_RE, text, has_win)
         
         # Se não encontrar no formato acima, procurar em outros formatos
         if not home_win:
-            home_win = re.search(r'vitória.*?(\d+[.,]\d+)', text, re.IGNORECASE)
+            home_win = _search(_HOME_WIN_ALT_RE, text, has_win)
         if not draw:
-            draw = re.search(r'empate.*?(\d+[.,]\d+)', text, re.IGNORECASE)
+            draw = _search(_DRAW_ALT_RE, text, has_draw)
         if not away_win:
-            away_win = re.search(r'vitória do.*?visitante.*?(\d+[.,]\d+)', text, re.IGNORECASE)
+            away_win = _search(_AWAY_WIN_ALT_RE, text, has_win)
         
         # Tentar outro formato comum
         if not (home_win and draw and away_win):
             # Procurar por padrões como "1.56 para vitória"
-            home_win = re.search(r'(\d+[.,]\d+).*?vitória', text, re.IGNORECASE)
-            draw = re.search(r'(\d+[.,]\d+).*?empate', text, re.IGNORECASE)
-            away_win = re.search(r'(\d+[.,]\d+).*?vitória do.*?visitante', text, re.IGNORECASE)
+            home_win = _search(_HOME_WIN_PREFIX_RE, text, has_win)
+            draw = _search(_DRAW_PREFIX_RE, text, has_draw)
+            away_win = _search(_AWAY_WIN_PREFIX_RE, text, has_win)
         
         # Tentar outro formato ainda mais genérico
         if not (home_win and draw and away_win):
             # Procurar por padrões como "Arsenal (1.56)"
-            odds_pattern = r'(\d+[.,]\d+)'
-            all_odds = re.findall(odds_pattern, text)
+            all_odds = _ODDS_NUM_RE.findall(text)
             if len(all_odds) >= 3:
-                # Assumir que as primeiras três odds são 1X2
-                home_win_val = float(all_odds[0].replace(',', '.'))
-                draw_val = float(all_odds[1].replace(',', '.'))
-                away_win_val = float(all_odds[2].replace(',', '.'))
+                # Assumir que as primeiras três odds são 1X2 (conversão vetorizada)
+                values = np.char.replace(np.array(all_odds[:3]), ',', '.').astype(np.float64)
                 
                 # Verificar se são odds válidas (entre 1.01 e 20.0)
-                if 1.01 <= home_win_val <= 20.0 and 1.01 <= draw_val <= 20.0 and 1.01 <= away_win_val <= 20.0:
-                    odds['1'] = home_win_val
-                    odds['X'] = draw_val
-                    odds['2'] = away_win_val
+                if ((values >= 1.01) & (values <= 20.0)).all():
+                    odds['1'], odds['X'], odds['2'] = values.tolist()
         
         # Extrair valores se encontrados
         if home_win:
@@ -140,56 +340,34 @@ def extract_odds(text):
     
     # Extrair odds Over/Under
     try:
-        over_pattern = r'[Oo]ver\s+(\d+[.,]\d+).*?(\d+[.,]\d+)'
-        under_pattern = r'[Uu]nder\s+(\d+[.,]\d+).*?(\d+[.,]\d+)'
-        
-        over_matches = re.findall(over_pattern, text)
-        under_matches = re.findall(under_pattern, text)
-        
         # Procurar especificamente por over 2.5
-        over_25_pattern = r'[Oo]ver\s+2[.,]5.*?(\d+[.,]\d+)'
-        over_25_match = re.search(over_25_pattern, text)
+        over_25_match = _search(_OVER_25_RE, text, 'over' in anchors)
         if over_25_match:
             odds['Over 2.5'] = float(over_25_match.group(1).replace(',', '.'))
         
-        # Processar todas as correspondências de over
-        for match in over_matches:
-            try:
-                limit = float(match[0].replace(',', '.'))
-                odd = float(match[1].replace(',', '.'))
-                if 1.01 <= odd <= 20.0:  # Verificar se é uma odd válida
-                    odds[f'Over {limit}'] = odd
-            except:
-                continue
-        
-        # Processar todas as correspondências de under
-        for match in under_matches:
-            try:
-                limit = float(match[0].replace(',', '.'))
-                odd = float(match[1].replace(',', '.'))
-                if 1.01 <= odd <= 20.0:  # Verificar se é uma odd válida
-                    odds[f'Under {limit}'] = odd
-            except:
+        # Processar todas as correspondências de over/under: pares (limite, odd)
+        # lidos direto dos grupos, sem montar a lista intermediária do findall
+        for prefix, pattern, anchor in (('Over', _OVER_RE, 'over'), ('Under', _UNDER_RE, 'under')):
+            if anchor not in anchors:
                 continue
+            for m in pattern.finditer(text):
+                limit, odd = m.group(1, 2)
+                odd = float(odd.translate(_DECIMAL_TBL))
+                if 1.01 <= odd <= 20.0:  # Verificar se são odds válidas
+                    odds[f'{prefix} {float(limit.translate(_DECIMAL_TBL))}'] = odd
     except:
         pass
     
     # Extrair odds BTTS (Ambas Marcam)
     try:
-        btts_yes_pattern = r'[Aa]mbas\s+[Mm]arcam\s+[Ss]im.*?(\d+[.,]\d+)'
-        btts_no_pattern = r'[Aa]mbas\s+[Mm]arcam\s+[Nn]ão.*?(\d+[.,]\d+)'
-        
-        # Padrão alternativo
-        alt_btts_yes_pattern = r'BTTS.*?[Ss]im.*?(\d+[.,]\d+)'
-        alt_btts_no_pattern = r'BTTS.*?[Nn]ão.*?(\d+[.,]\d+)'
-        
-        btts_yes_match = re.search(btts_yes_pattern, text) or re.search(alt_btts_yes_pattern, text)
-        btts_no_match = re.search(btts_no_pattern, text) or re.search(alt_btts_no_pattern, text)
-        
-        if btts_yes_match:
-            odds['Ambas Marcam Sim'] = float(btts_yes_match.group(1).replace(',', '.'))
-        if btts_no_match:
-            odds['Ambas Marcam Não'] = float(btts_no_match.group(1).replace(',', '.'))
+        has_btts = 'ambas' in anchors or 'btts' in anchors
+        btts_yes = _search_either(_BTTS_YES_RE, text, has_btts)
+        btts_no = _search_either(_BTTS_NO_RE, text, has_btts)
+        
+        if btts_yes:
+            odds['Ambas Marcam Sim'] = float(btts_yes.replace(',', '.'))
+        if btts_no:
+            odds['Ambas Marcam Não'] = float(btts_no.replace(',', '.'))
     except:
         pass
     
@@ -206,11 +384,11 @@ def extract_head_to_head_stats(text):
         dict: Dicionário com estatísticas de confrontos diretos
     """
     h2h_stats = {}
+    anchors = _find_anchors(_H2H_ANCHORS_RE, text)
     
     # Extrair número total de jogos
     try:
-        total_matches_pattern = r'(\d+)\s*[Jj]ogos'
-        total_matches_match = re.search(total_matches_pattern, text)
+        total_matches_match = _search(_TOTAL_MATCHES_RE, text, 'jogos' in anchors)
         if total_matches_match:
             h2h_stats['total_matches'] = int(total_matches_match.group(1))
     except:
@@ -219,13 +397,9 @@ def extract_head_to_head_stats(text):
     # Extrair percentuais de vitórias/empates/derrotas
     try:
         # Procurar por padrões como "63% Vitórias"
-        home_wins_pattern = r'(\d+)%.*?[Vv]itórias'
-        draws_pattern = r'(\d+)%.*?[Ee]mpates'
-        away_wins_pattern = r'(\d+)%.*?[Dd]errotas'
-        
-        home_wins_match = re.search(home_wins_pattern, text)
-        draws_match = re.search(draws_pattern, text)
-        away_wins_match = re.search(away_wins_pattern, text)
+        home_wins_match = _search(_H2H_HOME_WINS_RE, text, 'vitorias' in anchors)
+        draws_match = _search(_H2H_DRAWS_RE, text, 'empates' in anchors)
+        away_wins_match = _search(_H2H_AWAY_WINS_RE, text, 'derrotas' in anchors)
         
         if home_wins_match:
             h2h_stats['home_wins_pct'] = int(home_wins_match.group(1)) / 100
@@ -239,15 +413,11 @@ def extract_head_to_head_stats(text):
     # Extrair estatísticas de gols
     try:
         # Procurar por padrões como "92% Mais de 1.5"
-        over_15_pattern = r'(\d+)%\s*[Mm]ais\s*de\s*1[.,]5'
-        over_25_pattern = r'(\d+)%\s*[Mm]ais\s*de\s*2[.,]5'
-        over_35_pattern = r'(\d+)%\s*[Mm]ais\s*de\s*3[.,]5'
-        btts_pattern = r'(\d+)%\s*AM'  # AM = Ambas Marcam
-        
-        over_15_match = re.search(over_15_pattern, text)
-        over_25_match = re.search(over_25_pattern, text)
-        over_35_match = re.search(over_35_pattern, text)
-        btts_match = re.search(btts_pattern, text)
+        has_mais = 'mais' in anchors
+        over_15_match = _search(_H2H_OVER_15_RE, text, has_mais)
+        over_25_match = _search(_H2H_OVER_25_RE, text, has_mais)
+        over_35_match = _search(_H2H_OVER_35_RE, text, has_mais)
+        btts_match = _search(_H2H_BTTS_RE, text, 'am' in anchors)
         
         if over_15_match:
             h2h_stats['over_15_pct'] = int(over_15_match.group(1)) / 100
@@ -263,8 +433,7 @@ def extract_head_to_head_stats(text):
     # Extrair resultados recentes
     try:
         # Procurar por padrões como "21/12 2024 Crystal Palace 1 Arsenal 5"
-        recent_matches_pattern = r'(\d{2}/\d{2}\s+\d{4})\s+([A-Za-z\s]+)\s*(\d+)\s*([A-Za-z\s]+)\s*(\d+)'
-        recent_matches = re.findall(recent_matches_pattern, text)
+        recent_matches = _RECENT_MATCHES_RE.findall(text)
         
         if recent_matches:
             h2h_stats['recent_matches'] = []
@@ -311,18 +480,23 @@ def extract_team_stats(text, teams):
     
     home_team, away_team = teams
     
+    # Verificações literais (str in, muito mais baratas que um regex): todos os
+    # padrões abaixo exigem o nome do time e a palavra-chave da estatística
+    has_home = home_team in text
+    has_away = away_team in text
+    if not (has_home or has_away):
+        return team_stats
+    
+    home_res = _team_patterns(home_team)
+    away_res = _team_patterns(away_team)
+    
     # Extrair pontos por jogo
     try:
-        # Procurar por padrões como "2.19 Pontos por jogo"
-        home_ppg_pattern = r'(\d+[.,]\d+).*?[Pp]ontos\s*por\s*jogo.*?' + re.escape(home_team)
-        away_ppg_pattern = r'(\d+[.,]\d+).*?[Pp]ontos\s*por\s*jogo.*?' + re.escape(away_team)
-        
-        # Padrões alternativos
-        alt_home_ppg_pattern = re.escape(home_team) + r'.*?(\d+[.,]\d+).*?[Pp]PJ'
-        alt_away_ppg_pattern = re.escape(away_team) + r'.*?(\d+[.,]\d+).*?[Pp]PJ'
-        
-        home_ppg_match = re.search(home_ppg_pattern, text) or re.search(alt_home_ppg_pattern, text)
-        away_ppg_match = re.search(away_ppg_pattern, text) or re.search(alt_away_ppg_pattern, text)
+        # Procurar por padrões como "2.19 Pontos por jogo" (ou "Arsenal ... 2.19 PPJ")
+        has_ppg = 'ontos' in text
+        has_ppj = 'PJ' in text
+        home_ppg_match = _search(home_res['ppg'], text, has_home and has_ppg) or _search(home_res['ppg_alt'], text, has_home and has_ppj)
+        away_ppg_match = _search(away_res['ppg'], text, has_away and has_ppg) or _search(away_res['ppg_alt'], text, has_away and has_ppj)
         
         if home_ppg_match:
             team_stats['home']['points_per_game'] = float(home_ppg_match.group(1).replace(',', '.'))
@@ -334,15 +508,9 @@ def extract_team_stats(text, teams):
     # Extrair percentuais de vitórias
     try:
         # Procurar por padrões como "63% Vitória"
-        home_wins_pattern = r'(\d+)%.*?[Vv]itória.*?' + re.escape(home_team)
-        away_wins_pattern = r'(\d+)%.*?[Vv]itória.*?' + re.escape(away_team)
-        
-        # Padrões alternativos
-        alt_home_wins_pattern = re.escape(home_team) + r'.*?[Vv]itória.*?(\d+)%'
-        alt_away_wins_pattern = re.escape(away_team) + r'.*?[Vv]itória.*?(\d+)%'
-        
-        home_wins_match = re.search(home_wins_pattern, text) or re.search(alt_home_wins_pattern, text)
-        away_wins_match = re.search(away_wins_pattern, text) or re.search(alt_away_wins_pattern, text)
+        has_wins = 'itória' in text
+        home_wins_match = _search(home_res['wins'], text, has_home and has_wins) or _search(home_res['wins_alt'], text, has_home and has_wins)
+        away_wins_match = _search(away_res['wins'], text, has_away and has_wins) or _search(away_res['wins_alt'], text, has_away and has_wins)
         
         if home_wins_match:
             team_stats['home']['win_percentage'] = int(home_wins_match.group(1)) / 100
@@ -354,19 +522,13 @@ def extract_team_stats(text, teams):
     # Extrair gols marcados/sofridos
     try:
         # Procurar por padrões como "1.94 Gols / Jogo"
-        home_scored_pattern = r'(\d+[.,]\d+).*?[Gg]ols\s*[Mm]arcados.*?' + re.escape(home_team)
-        home_conceded_pattern = r'(\d+[.,]\d+).*?[Gg]ols\s*[Ss]ofridos.*?' + re.escape(home_team)
-        away_scored_pattern = r'(\d+[.,]\d+).*?[Gg]ols\s*[Mm]arcados.*?' + re.escape(away_team)
-        away_conceded_pattern = r'(\d+[.,]\d+).*?[Gg]ols\s*[Ss]ofridos.*?' + re.escape(away_team)
-        
-        # Padrões alternativos
-        alt_home_scored_pattern = re.escape(home_team) + r'.*?(\d+[.,]\d+).*?[Gg]ols\s*\/\s*[Jj]ogo'
-        alt_away_scored_pattern = re.escape(away_team) + r'.*?(\d+[.,]\d+).*?[Gg]ols\s*\/\s*[Jj]ogo'
-        
-        home_scored_match = re.search(home_scored_pattern, text) or re.search(alt_home_scored_pattern, text)
-        home_conceded_match = re.search(home_conceded_pattern, text)
-        away_scored_match = re.search(away_scored_pattern, text) or re.search(alt_away_scored_pattern, text)
-        away_conceded_match = re.search(away_conceded_pattern, text)
+        has_scored = 'arcados' in text
+        has_conceded = 'ofridos' in text
+        has_per_game = '/' in text
+        home_scored_match = _search(home_res['scored'], text, has_home and has_scored) or _search(home_res['scored_alt'], text, has_home and has_per_game)
+        home_conceded_match = _search(home_res['conceded'], text, has_home and has_conceded)
+        away_scored_match = _search(away_res['scored'], text, has_away and has_scored) or _search(away_res['scored_alt'], text, has_away and has_per_game)
+        away_conceded_match = _search(away_res['conceded'], text, has_away and has_conceded)
         
         if home_scored_match:
             team_stats['home']['goals_scored_per_game'] = float(home_scored_match.group(1).replace(',', '.'))
@@ -382,11 +544,9 @@ def extract_team_stats(text, teams):
     # Extrair clean sheets
     try:
         # Procurar por padrões como "38% Clean Sheets"
-        home_cs_pattern = r'(\d+)%.*?[Cc]lean\s*[Ss]heets.*?' + re.escape(home_team)
-        away_cs_pattern = r'(\d+)%.*?[Cc]lean\s*[Ss]heets.*?' + re.escape(away_team)
-        
-        home_cs_match = re.search(home_cs_pattern, text)
-        away_cs_match = re.search(away_cs_pattern, text)
+        has_cs = 'heets' in text
+        home_cs_match = _search(home_res['clean_sheets'], text, has_home and has_cs)
+        away_cs_match = _search(away_res['clean_sheets'], text, has_away and has_cs)
         
         if home_cs_match:
             team_stats['home']['clean_sheets_percentage'] = int(home_cs_match.group(1)) / 100
@@ -398,12 +558,15 @@ def extract_team_stats(text, teams):
     # Extrair xG (Expected Goals)
     try:
         # Procurar por padrões como "xG: 1.94"
-        home_xg_pattern = r'xG.*?(\d+[.,]\d+).*?' + re.escape(home_team)
-        away_xg_pattern = r'xG.*?(\d+[.,]\d+).*?' + re.escape(away_team)
-        
-        home_xg_match = re.search(home_xg_pattern, text)
-        away_xg_match = re.search(away_xg_pattern, text)
+        has_xg = 'xG' in text
+        home_xg_match = _search(home_res['xg'], text, has_home and has_xg)
+        away_xg_match = _search(away_res['xg'], text, has_away and has_xg)
         
         if home_xg_match:
-            team_stats['home']['expected_goals'] = float(home_xg_match.group(1).replace(',',
-(Content truncated due to size limit. Use line ranges to read in chunks)
+            team_stats['home']['expected_goals'] = float(home_xg_match.group(1).replace(',', '.'))
+        if away_xg_match:
+            team_stats['away']['expected_goals'] = float(away_xg_match.group(1).replace(',', '.'))
+    except:
+        pass
+    
+    return team_stats
@@ -1,195 +1,261 @@
+import io
+import matplotlib
+matplotlib.use('Agg')  # Backend sem interface gráfica: as figuras só são renderizadas como imagem
 import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 import pandas as pd
+from functools import lru_cache
 
-def create_probability_matrix_heatmap(prob_matrix, title):
+# Mercados principais, na ordem em que aparecem no gráfico de probabilidades
+_MAIN_MARKETS = (
+    '1', 'X', '2',
+    'Over 0.5', 'Under 0.5',
+    'Over 1.5', 'Under 1.5',
+    'Over 2.5', 'Under 2.5',
+    'Over 3.5', 'Under 3.5',
+    'Over 4.5', 'Under 4.5',
+    'Ambas Marcam Sim', 'Ambas Marcam Não'
+)
+
+# Métricas do gráfico radar: (rótulo, chave do time da casa, chave do time de fora)
+_METRICS = (
+    ('Gols Marcados', 'gols_marcados_casa', 'gols_marcados_fora'),
+    ('Gols Sofridos', 'gols_sofridos_casa', 'gols_sofridos_fora'),
+    ('Posse de Bola', 'posse_casa', 'posse_fora'),
+    ('Finalizações', 'finalizacoes_casa', 'finalizacoes_fora'),
+    ('Precisão Passes', 'precisao_passes_casa', 'precisao_passes_fora'),
+    ('Vitórias %', 'vitorias_pct_casa', 'vitorias_pct_fora')
+)
+
+def _render(fig, return_fig, dpi=90):
     """
-    Cria um heatmap para visualizar a matriz de probabilidades de placares
+    Rasteriza a figura em PNG na memória e a fecha, liberando os objetos do matplotlib
     
     Args:
-        prob_matrix: DataFrame com probabilidades de placares
-        title: Título do gráfico
+        fig: Figura matplotlib
+        return_fig: Se True, devolve a própria figura sem rasterizar
+        dpi: Resolução do PNG
         
     Returns:
-        Figura matplotlib
+        io.BytesIO com o PNG, ou a Figura matplotlib se return_fig=True
     """
-    plt.figure(figsize=(10, 8))
-    ax = sns.heatmap(prob_matrix, annot=True, cmap='YlGnBu', fmt='.3f')
-    plt.title(title)
-    plt.tight_layout()
+    if return_fig:
+        return fig
+    
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    buf.seek(0)
+    return buf
+
+@lru_cache(maxsize=8)
+def _radar_angles(n):
+    """
+    Calcula os ângulos de um gráfico radar com n eixos
     
-    return plt.gcf()
+    Args:
+        n: Número de métricas (eixos)
+        
+    Returns:
+        Array numpy somente leitura com n+1 ângulos (o último fecha o círculo)
+    """
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    angles = np.concatenate((angles, angles[:1]))
+    angles.setflags(write=False)
+    return angles
+
+def create_probability_matrix_heatmap(prob_matrix, title, return_fig=False):
+    """
+    Cria um heatmap para visualizar a matriz de probabilidades de placares
+    
+    Args:
+        prob_matrix: Array numpy (linhas: gols da casa, colunas: gols de fora) com probabilidades de placares
+        title: Título do gráfico
+        return_fig: Se True, retorna a Figura em vez do PNG
+
+    Returns:
+        PNG em memória (io.BytesIO), ou a Figura matplotlib se return_fig=True
+    """
+    # Rótulos montados apenas aqui, na fronteira de visualização
+    if isinstance(prob_matrix, pd.DataFrame):
+        row_labels = prob_matrix.index.tolist()
+        col_labels = prob_matrix.columns.tolist()
+        values = prob_matrix.to_numpy()
+    else:
+        values = np.asarray(prob_matrix)
+        row_labels = [f'Casa {i}' for i in range(values.shape[0])]
+        col_labels = [f'Fora {j}' for j in range(values.shape[1])]
+    
+    # O mapa de cores é quantizado em 8 bits, então float32 contíguo basta para a
+    # imagem; os rótulos continuam formatados a partir dos valores originais
+    arr = np.ascontiguousarray(values, dtype=np.float32)
+    
+    # Heatmap desenhado direto com imshow (sem o laço de anotação do seaborn)
+    fig, ax = plt.subplots(figsize=(10, 8))
+    im = ax.imshow(arr, cmap='YlGnBu', aspect='auto')
+    fig.colorbar(im, ax=ax)
+    
+    ax.set_xticks(np.arange(arr.shape[1]))
+    ax.set_xticklabels(col_labels)
+    ax.set_yticks(np.arange(arr.shape[0]))
+    ax.set_yticklabels(row_labels)
+    
+    # Anotações formatadas de uma vez; texto branco sobre células escuras,
+    # pelo mesmo critério de luminância do seaborn
+    labels = np.char.mod('%.3f', values)
+    rgb = im.cmap(im.norm(arr))[..., :3]
+    rgb = np.where(rgb <= .03928, rgb / 12.92, ((rgb + .055) / 1.055) ** 2.4)
+    text_colors = np.where(rgb @ [.2126, .7152, .0722] > .408, 'black', 'white')
+    for (y, x), label in np.ndenumerate(labels):
+        ax.text(x, y, label, ha='center', va='center', color=text_colors[y, x])
+    
+    ax.set_title(title)
+    fig.tight_layout()
+    
+    return _render(fig, return_fig)
 
-def create_market_probabilities_chart(probabilities):
+def create_market_probabilities_chart(probabilities, return_fig=False):
     """
     Cria um gráfico de barras para visualizar probabilidades de diferentes mercados
     
     Args:
         probabilidades: Dicionário com probabilidades para diferentes mercados
+        return_fig: Se True, retorna a Figura em vez do PNG
         
     Returns:
-        Figura matplotlib
+        PNG em memória (io.BytesIO), ou a Figura matplotlib se return_fig=True
     """
-    # Selecionar mercados principais
-    main_markets = [
-        '1', 'X', '2', 
-        'Over 0.5', 'Under 0.5',
-        'Over 1.5', 'Under 1.5',
-        'Over 2.5', 'Under 2.5',
-        'Over 3.5', 'Under 3.5',
-        'Over 4.5', 'Under 4.5',
-        'Ambas Marcam Sim', 'Ambas Marcam Não'
-    ]
-    
-    # Filtrar mercados disponíveis
-    markets = []
-    probs = []
-    
-    for market in main_markets:
-        if market in probabilities:
-            markets.append(market)
-            probs.append(probabilities[market])
-    
-    plt.figure(figsize=(12, 6))
-    bars = plt.bar(markets, probs)
+    # Filtrar mercados principais disponíveis
+    pairs = [(m, probabilities[m]) for m in _MAIN_MARKETS if m in probabilities]
+    markets, probs = zip(*pairs) if pairs else ((), ())
     
-    # Adicionar valores nas barras
-    for bar in bars:
-        height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height + 0.01,
-                 f'{height:.2%}', ha='center', va='bottom')
-    
-    plt.title('Probabilidades por Mercado')
-    plt.ylabel('Probabilidade')
-    plt.ylim(0, 1)
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    
-    return plt.gcf()
+    fig, ax = plt.subplots(figsize=(12, 6))
+    bars = ax.bar(markets, probs)
+    
+    # Adicionar valores nas barras (rótulos formatados de uma vez pelo numpy)
+    ax.bar_label(bars, labels=np.char.mod('%.2f%%', np.asarray(probs, dtype=np.float64) * 100).tolist(), padding=3)
+    
+    ax.set_title('Probabilidades por Mercado')
+    ax.set_ylabel('Probabilidade')
+    ax.set_ylim(0, 1)
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+    fig.tight_layout()
+    
+    return _render(fig, return_fig)
 
-def create_most_probable_scores_chart(scores, title):
+def create_most_probable_scores_chart(scores, title, return_fig=False):
     """
     Cria um gráfico de barras para visualizar os placares mais prováveis
     
     Args:
         scores: Lista de tuplas (placar, probabilidade)
         title: Título do gráfico
+        return_fig: Se True, retorna a Figura em vez do PNG
         
     Returns:
-        Figura matplotlib
+        PNG em memória (io.BytesIO), ou a Figura matplotlib se return_fig=True
     """
     labels = [p[0] for p in scores]
     probs = [p[1] for p in scores]
     
-    plt.figure(figsize=(10, 6))
-    bars = plt.bar(labels, probs)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    bars = ax.bar(labels, probs)
     
     # Adicionar valores nas barras
-    for bar in bars:
-        height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height + 0.01,
-                 f'{height:.2%}', ha='center', va='bottom')
+    ax.bar_label(bars, labels=np.char.mod('%.2f%%', np.asarray(probs, dtype=np.float64) * 100).tolist(), padding=3)
     
-    plt.title(title)
-    plt.ylabel('Probabilidade')
-    plt.ylim(0, max(probs) * 1.2)
-    plt.tight_layout()
+    ax.set_title(title)
+    ax.set_ylabel('Probabilidade')
+    ax.set_ylim(0, max(probs) * 1.2)
+    fig.tight_layout()
     
-    return plt.gcf()
+    return _render(fig, return_fig)
 
-def create_historical_comparison_chart(historical_data, title):
+def create_historical_comparison_chart(historical_data, title, return_fig=False):
     """
     Cria um gráfico de barras para visualizar os placares históricos mais comuns
     
     Args:
         historical_data: Dicionário com dados históricos
         title: Título do gráfico
+        return_fig: Se True, retorna a Figura em vez do PNG
         
     Returns:
-        Figura matplotlib
+        PNG em memória (io.BytesIO), ou a Figura matplotlib se return_fig=True
     """
     if 'common_scores' not in historical_data or not historical_data['common_scores']:
         # Criar gráfico vazio se não houver dados
-        plt.figure(figsize=(10, 6))
-        plt.title(f"{title} (Sem dados históricos suficientes)")
-        plt.ylabel('Frequência')
-        plt.tight_layout()
-        return plt.gcf()
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.set_title(f"{title} (Sem dados históricos suficientes)")
+        ax.set_ylabel('Frequência')
+        fig.tight_layout()
+        return _render(fig, return_fig)
     
     scores = [s[0] for s in historical_data['common_scores']]
     counts = [s[1] for s in historical_data['common_scores']]
     
-    plt.figure(figsize=(10, 6))
-    bars = plt.bar(scores, counts)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    bars = ax.bar(scores, counts)
     
     # Adicionar valores nas barras
-    for bar in bars:
-        height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                 str(int(height)), ha='center', va='bottom')
+    ax.bar_label(bars, labels=np.char.mod('%d', np.asarray(counts, dtype=np.int64)).tolist(), padding=3)
     
-    plt.title(title)
-    plt.ylabel('Frequência')
-    plt.tight_layout()
+    ax.set_title(title)
+    ax.set_ylabel('Frequência')
+    fig.tight_layout()
     
-    return plt.gcf()
+    return _render(fig, return_fig)
 
-def create_expected_value_chart(market_ev):
+def create_expected_value_chart(market_ev, return_fig=False):
     """
     Cria um gráfico de barras para visualizar o valor esperado de diferentes mercados
     
     Args:
         market_ev: Dicionário com valor esperado para diferentes mercados
+        return_fig: Se True, retorna a Figura em vez do PNG
         
     Returns:
-        Figura matplotlib
+        PNG em memória (io.BytesIO), ou a Figura matplotlib se return_fig=True
     """
     # Filtrar apenas mercados com valor esperado numérico
-    markets = []
-    values = []
+    numeric_ev = [(market, ev) for market, ev in market_ev.items() if isinstance(ev, (int, float))]
     
-    for market, ev in market_ev.items():
-        if isinstance(ev, (int, float)):
-            markets.append(market)
-            values.append(ev)
-    
-    if not markets:
+    if not numeric_ev:
         # Criar gráfico vazio se não houver dados
-        plt.figure(figsize=(10, 6))
-        plt.title("Valor Esperado por Mercado (Sem dados suficientes)")
-        plt.ylabel('Valor Esperado')
-        plt.tight_layout()
-        return plt.gcf()
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.set_title("Valor Esperado por Mercado (Sem dados suficientes)")
+        ax.set_ylabel('Valor Esperado')
+        fig.tight_layout()
+        return _render(fig, return_fig)
     
-    # Ordenar por valor esperado
-    sorted_indices = np.argsort(values)[::-1]
-    markets = [markets[i] for i in sorted_indices]
-    values = [values[i] for i in sorted_indices]
+    markets = np.array([market for market, _ in numeric_ev], dtype=object)
+    values = np.fromiter((ev for _, ev in numeric_ev), dtype=np.float64, count=len(numeric_ev))
     
-    plt.figure(figsize=(12, 6))
-    bars = plt.bar(markets, values)
+    # Ordenar por valor esperado (um único índice aplicado aos dois arrays)
+    order = np.argsort(values)[::-1]
+    markets = markets[order]
+    values = values[order]
     
     # Colorir barras com base no valor (verde para >1, vermelho para <1)
-    for i, bar in enumerate(bars):
-        bar.set_color('green' if values[i] > 1 else 'red')
-        
-        # Adicionar valores nas barras
-        height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height + 0.01,
-                 f'{height:.2f}', ha='center', va='bottom')
+    colors = np.where(values > 1, 'green', 'red')
+    
+    fig, ax = plt.subplots(figsize=(12, 6))
+    bars = ax.bar(markets.tolist(), values, color=colors.tolist())
+    
+    # Adicionar valores nas barras
+    ax.bar_label(bars, labels=[f'{v:.2f}' for v in values], padding=3)
     
     # Adicionar linha horizontal em y=1
-    plt.axhline(y=1, color='black', linestyle='--', alpha=0.7)
+    ax.axhline(y=1, color='black', linestyle='--', alpha=0.7)
     
-    plt.title('Valor Esperado por Mercado')
-    plt.ylabel('Valor Esperado')
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
+    ax.set_title('Valor Esperado por Mercado')
+    ax.set_ylabel('Valor Esperado')
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+    fig.tight_layout()
     
-    return plt.gcf()
+    return _render(fig, return_fig)
 
-def create_team_comparison_chart(stats_data, home_team, away_team):
+def create_team_comparison_chart(stats_data, home_team, away_team, return_fig=False):
     """
     Cria um gráfico de radar para comparar estatísticas dos times
     
@@ -197,66 +263,51 @@ def create_team_comparison_chart(stats_data, home_team, away_team):
         stats_data: Dicionário com estatísticas dos times
         home_team: Nome do time da casa
         away_team: Nome do time visitante
+        return_fig: Se True, retorna a Figura em vez do PNG
         
     Returns:
-        Figura matplotlib
+        PNG em memória (io.BytesIO), ou a Figura matplotlib se return_fig=True
     """
-    # Métricas para comparação
-    metrics = [
-        ('Gols Marcados', 'gols_marcados_casa', 'gols_marcados_fora'),
-        ('Gols Sofridos', 'gols_sofridos_casa', 'gols_sofridos_fora'),
-        ('Posse de Bola', 'posse_casa', 'posse_fora'),
-        ('Finalizações', 'finalizacoes_casa', 'finalizacoes_fora'),
-        ('Precisão Passes', 'precisao_passes_casa', 'precisao_passes_fora'),
-        ('Vitórias %', 'vitorias_pct_casa', 'vitorias_pct_fora')
-    ]
-    
     # Verificar quais métricas estão disponíveis
-    available_metrics = []
-    home_values = []
-    away_values = []
-    
-    for label, home_key, away_key in metrics:
-        if home_key in stats_data and away_key in stats_data:
-            available_metrics.append(label)
-            home_values.append(stats_data[home_key])
-            away_values.append(stats_data[away_key])
+    available = [m for m in _METRICS if m[1] in stats_data and m[2] in stats_data]
     
-    if not available_metrics:
+    if not available:
         # Criar gráfico vazio se não houver dados suficientes
-        plt.figure(figsize=(10, 8))
-        plt.title(f"Comparação: {home_team} vs {away_team} (Sem dados suficientes)")
-        plt.tight_layout()
-        return plt.gcf()
+        fig, ax = plt.subplots(figsize=(10, 8))
+        ax.set_title(f"Comparação: {home_team} vs {away_team} (Sem dados suficientes)")
+        fig.tight_layout()
+        return _render(fig, return_fig)
     
     # Número de variáveis
-    N = len(available_metrics)
+    N = len(available)
+    available_metrics = [label for label, _, _ in available]
     
-    # Ângulos para o gráfico radar
-    angles = [n / float(N) * 2 * np.pi for n in range(N)]
-    angles += angles[:1]  # Fechar o círculo
+    # Ângulos para o gráfico radar (já com o círculo fechado)
+    angles = _radar_angles(N)
     
-    # Valores para o gráfico radar
-    home_values += home_values[:1]
-    away_values += away_values[:1]
+    # Valores para o gráfico radar, fechando o círculo com o primeiro valor
+    home_values = np.fromiter((stats_data[key] for _, key, _ in available), dtype=np.float64, count=N)
+    away_values = np.fromiter((stats_data[key] for _, _, key in available), dtype=np.float64, count=N)
+    home_values = np.concatenate((home_values, home_values[:1]))
+    away_values = np.concatenate((away_values, away_values[:1]))
     
     # Criar figura
-    plt.figure(figsize=(10, 8))
-    ax = plt.subplot(111, polar=True)
+    fig, ax = plt.subplots(figsize=(10, 8), subplot_kw={'polar': True})
     
     # Adicionar linhas para cada time
-    plt.plot(angles, home_values, 'o-', linewidth=2, label=home_team)
-    plt.plot(angles, away_values, 'o-', linewidth=2, label=away_team)
-    plt.fill(angles, home_values, alpha=0.25)
-    plt.fill(angles, away_values, alpha=0.25)
+    ax.plot(angles, home_values, 'o-', linewidth=2, label=home_team)
+    ax.plot(angles, away_values, 'o-', linewidth=2, label=away_team)
+    ax.fill(angles, home_values, alpha=0.25)
+    ax.fill(angles, away_values, alpha=0.25)
     
     # Adicionar rótulos
-    plt.xticks(angles[:-1], available_metrics)
+    ax.set_xticks(angles[:-1])
+    ax.set_xticklabels(available_metrics)
     
     # Adicionar legenda
-    plt.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1))
+    ax.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1))
     
-    plt.title(f"Comparação: {home_team} vs {away_team}")
-    plt.tight_layout()
+    ax.set_title(f"Comparação: {home_team} vs {away_team}")
+    fig.tight_layout()
     
-    return plt.gcf()
+    return _render(fig, return_fig)
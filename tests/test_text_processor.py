@@ -0,0 +1,33 @@
+import os
+import sys
+import unittest
+
+# Adicionar diretório dos módulos ao início do path (antes da cópia na raiz)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from text_processor import extract_football_stats_batch, extract_football_stats_from_text
+
+TEXTS = [
+    "Arsenal x Chelsea\nodds para vitória: 1,56\nOver 2.5 1.80\nxG: 1.94 Arsenal",
+    "Crystal Palace vs Arsenal\nAmbas Marcam Sim 1.70\n10 jogos\n63% Vitórias",
+    "Time da Casa: Spurs\nTime Visitante: Everton\nUnder 1.5 2,10",
+    "",
+]
+
+class ExtractFootballStatsBatchTest(unittest.TestCase):
+    def test_batch_matches_sequential(self):
+        expected = [extract_football_stats_from_text(text) for text in TEXTS]
+
+        # Com processos e no caminho sequencial o resultado deve ser o mesmo, na mesma ordem
+        self.assertEqual(extract_football_stats_batch(TEXTS, max_workers=2), expected)
+        self.assertEqual(extract_football_stats_batch(TEXTS, max_workers=1), expected)
+
+    def test_single_text(self):
+        result = extract_football_stats_batch(TEXTS[:1])
+
+        self.assertEqual(result[0]['teams']['home'], 'Arsenal')
+        self.assertEqual(result[0]['odds']['Over 2.5'], 1.8)
+        self.assertEqual(result[0]['team_stats']['home']['expected_goals'], 1.94)
+
+if __name__ == '__main__':
+    unittest.main()